@@ -6,12 +6,33 @@ from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Per-connection pragmas. WAL lets readers (every Streamlit rerun) proceed
+# while a writer commits; synchronous=NORMAL is durable under WAL except on
+# power loss, and skips an fsync per commit. cache_size is in KiB when negative.
+# busy_timeout makes a second tab wait for a writer instead of failing with
+# "database is locked"; wal_autocheckpoint bounds the WAL file (in pages).
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA wal_autocheckpoint=1000",
+)
+
+def tune_connection(conn: sqlite3.Connection) -> None:
+    """Apply the standard pragmas to a freshly opened connection."""
+    for pragma in _CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+
 def init_db():
     """Initialize the database with schema."""
     if not settings.DATABASE_PATH.parent.exists():
         settings.DATABASE_PATH.parent.mkdir(parents=True, exist_ok=True)
         
     conn = sqlite3.connect(settings.DATABASE_PATH)
+    # journal_mode=WAL is persistent, so set it when the file is created
+    tune_connection(conn)
     
     schema_path = settings.BASE_DIR / "database" / "schema.sql"
     if schema_path.exists():
@@ -33,6 +54,7 @@ def get_connection():
         
     conn = sqlite3.connect(settings.DATABASE_PATH)
     conn.row_factory = sqlite3.Row
+    tune_connection(conn)
     try:
         yield conn
         conn.commit()
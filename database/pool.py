@@ -0,0 +1,100 @@
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List
+
+from config.settings import settings
+from database.connection import init_db, tune_connection
+
+# Read connections per pool; WAL lets them all read while the writer commits
+READ_POOL_SIZE = 5
+
+
+class ConnectionPool:
+    """
+    Long-lived SQLite connections shared across Streamlit sessions.
+
+    Holds READ_POOL_SIZE read-only connections handed out one borrower at a
+    time, and a single read-write connection serialized by a lock (SQLite
+    allows one writer anyway). The lock is process-wide, so write() is only
+    for short, database-only transactions: no network or other slow I/O may
+    happen while it is held, or every session's writes wait on it. Work that
+    interleaves API calls with writes (Drive uploads, Notion pages) opens its
+    own connection with database.connection.get_connection() instead, where
+    SQLite's write lock is only taken from the first INSERT/UPDATE to the
+    commit. Connections are opened with
+    check_same_thread=False because Streamlit runs each session on its
+    own thread; the queue and lock keep any one connection to one thread
+    at a time.
+    """
+
+    def __init__(self, read_size: int = READ_POOL_SIZE):
+        """
+        Open the pool's connections to settings.DATABASE_PATH, creating the
+        database if needed.
+
+        Args:
+            read_size: Number of read-only connections
+        """
+        db_path = settings.DATABASE_PATH
+        if not db_path.exists():
+            init_db()
+
+        self._writer = self._open(f"file:{db_path}?mode=rw")
+        self._write_lock = threading.Lock()
+
+        self._readers: List[sqlite3.Connection] = []
+        self._idle_readers: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        for _ in range(read_size):
+            reader = self._open(f"file:{db_path}?mode=ro")
+            self._readers.append(reader)
+            self._idle_readers.put(reader)
+
+    @staticmethod
+    def _open(uri: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        tune_connection(conn)
+        return conn
+
+    @contextmanager
+    def read(self) -> Iterator[sqlite3.Connection]:
+        """
+        Borrow a read-only connection, waiting if all are in use.
+
+        Writes through it raise sqlite3.OperationalError.
+        """
+        conn = self._idle_readers.get()
+        try:
+            yield conn
+        finally:
+            # End any implicit transaction so the next borrower sees fresh data
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle_readers.put(conn)
+
+    @contextmanager
+    def write(self) -> Iterator[sqlite3.Connection]:
+        """
+        Borrow the read-write connection as one transaction.
+
+        Commits when the block exits normally and rolls back otherwise,
+        so nothing half-done is left for the next borrower. Keep the block
+        to database work: no I/O while the lock is held.
+        """
+        with self._write_lock:
+            try:
+                yield self._writer
+            except BaseException:
+                self._writer.rollback()
+                raise
+            else:
+                self._writer.commit()
+
+    def close(self) -> None:
+        """Close every connection in the pool."""
+        with self._write_lock:
+            self._writer.close()
+        for reader in self._readers:
+            reader.close()
@@ -26,6 +26,32 @@ class ContentRepository(BaseRepository[ContentItem]):
         ))
         return item
     
+    def create_many(self, items: List[ContentItem]) -> List[ContentItem]:
+        """Insert several content items with one executemany call."""
+        query = """
+            INSERT INTO content_items (
+                id, topic_id, content_type, file_name, 
+                drive_file_id, drive_url, uploaded_at, 
+                file_size_bytes, is_active
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """
+        self.conn.executemany(query, [
+            (
+                item.id,
+                item.topic_id,
+                item.content_type.value,
+                item.file_name,
+                item.drive_file_id,
+                item.drive_url,
+                item.uploaded_at,
+                item.file_size_bytes,
+                item.is_active
+            )
+            for item in items
+        ])
+        return items
+    
     def get_by_id(self, id: str) -> Optional[ContentItem]:
         query = "SELECT * FROM content_items WHERE id = ?"
         cursor = self.conn.execute(query, (id,))
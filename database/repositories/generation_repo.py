@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Dict, Optional, List
 from database.repositories.base import BaseRepository
 from database.models import Generation, Stage, GenerationStatus
 from datetime import datetime
@@ -60,6 +60,20 @@ class GenerationRepository(BaseRepository[Generation]):
         cursor = self.conn.execute(query, (topic_id, stage.value))
         return [self._row_to_generation(row) for row in cursor.fetchall()]
 
+    def get_for_topic_by_stage(self, topic_id: str) -> Dict[Stage, List[Generation]]:
+        """Get all generations for a topic in one query, grouped by stage (newest version first)"""
+        query = """
+            SELECT * FROM generations
+            WHERE topic_id = ?
+            ORDER BY stage, version DESC
+        """
+        cursor = self.conn.execute(query, (topic_id,))
+        by_stage: Dict[Stage, List[Generation]] = {stage: [] for stage in Stage}
+        for row in cursor.fetchall():
+            generation = self._row_to_generation(row)
+            by_stage[generation.stage].append(generation)
+        return by_stage
+
     def get_latest_version(self, topic_id: str, stage: Stage) -> Optional[Generation]:
         """Get the most recent generation for a specific topic and stage"""
         query = """
@@ -1,6 +1,6 @@
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from database.repositories.base import BaseRepository
-from database.models import Module
+from database.models import Module, Topic
 from datetime import datetime
 
 class ModuleRepository(BaseRepository[Module]):
@@ -32,6 +32,65 @@ class ModuleRepository(BaseRepository[Module]):
         cursor = self.conn.execute(query)
         return [self._row_to_module(row) for row in cursor.fetchall()]
     
+    def get_all_with_topics(self) -> List[Tuple[Module, List[Topic]]]:
+        """
+        Fetch every module with its topics in a single query.
+
+        Returns:
+            (module, topics) pairs ordered by module name, topics by name.
+            Modules without topics get an empty list.
+        """
+        query = """
+            SELECT
+                m.id AS m_id, m.name AS m_name,
+                m.claude_project_name AS m_claude_project_name,
+                m.notion_database_id AS m_notion_database_id,
+                m.created_at AS m_created_at, m.updated_at AS m_updated_at,
+                t.id AS t_id, t.name AS t_name,
+                t.created_at AS t_created_at, t.updated_at AS t_updated_at
+            FROM modules m
+            LEFT JOIN topics t ON t.module_id = m.id
+            ORDER BY m.name ASC, t.name ASC
+        """
+        cursor = self.conn.execute(query)
+
+        tree: List[Tuple[Module, List[Topic]]] = []
+        for row in cursor.fetchall():
+            if not tree or tree[-1][0].id != row['m_id']:
+                module = Module(
+                    id=row['m_id'],
+                    name=row['m_name'],
+                    claude_project_name=row['m_claude_project_name'],
+                    notion_database_id=row['m_notion_database_id'],
+                    created_at=row['m_created_at'],
+                    updated_at=row['m_updated_at']
+                )
+                tree.append((module, []))
+            if row['t_id'] is not None:
+                tree[-1][1].append(Topic(
+                    id=row['t_id'],
+                    module_id=row['m_id'],
+                    name=row['t_name'],
+                    created_at=row['t_created_at'],
+                    updated_at=row['t_updated_at']
+                ))
+        return tree
+
+    def get_tree_version(self) -> str:
+        """
+        Cheap fingerprint of the modules/topics tables.
+
+        Changes whenever a module or topic is added, removed or updated, so it
+        can key caches of get_all_with_topics().
+        """
+        query = """
+            SELECT
+                (SELECT COUNT(*) || ':' || IFNULL(MAX(updated_at), '') FROM modules)
+                || '|' ||
+                (SELECT COUNT(*) || ':' || IFNULL(MAX(updated_at), '') FROM topics)
+        """
+        return self.conn.execute(query).fetchone()[0]
+
     def update(self, module: Module) -> Module:
         query = """
             UPDATE modules
@@ -17,6 +17,18 @@ class TopicRepository(BaseRepository[Topic]):
             topic.updated_at
         ))
         return topic
+
+    def create_many(self, topics: List[Topic]) -> List[Topic]:
+        """Insert several topics with one executemany call."""
+        query = """
+            INSERT INTO topics (id, module_id, name, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+        """
+        self.conn.executemany(query, [
+            (topic.id, topic.module_id, topic.name, topic.created_at, topic.updated_at)
+            for topic in topics
+        ])
+        return topics
     
     def get_by_id(self, id: str) -> Optional[Topic]:
         query = "SELECT * FROM topics WHERE id = ?"
@@ -6,6 +6,7 @@ CREATE TABLE IF NOT EXISTS modules (
     id TEXT PRIMARY KEY,
     name TEXT NOT NULL UNIQUE,
     claude_project_name TEXT,
+    notion_database_id TEXT,
     created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
 );
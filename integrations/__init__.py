@@ -1,3 +1,18 @@
-from .notion_client import NotionClient
-from .markdown_converter import markdown_to_notion_blocks, validate_blocks
-from .drive_client import DriveClient
+# Re-exports resolve on first access so importing one integration (or the
+# package) doesn't load every client library (notion-client, googleapiclient)
+import importlib
+
+_EXPORTS = {
+    "NotionClient": ".notion_client",
+    "markdown_to_notion_blocks": ".markdown_converter",
+    "validate_blocks": ".markdown_converter",
+    "DriveClient": ".drive_client",
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
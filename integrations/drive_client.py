@@ -5,6 +5,7 @@ from googleapiclient.discovery import build
 from googleapiclient.http import MediaFileUpload, MediaIoBaseUpload
 import os
 import pickle
+import threading
 from typing import Optional
 from io import BytesIO
 
@@ -14,12 +15,18 @@ SCOPES = ['https://www.googleapis.com/auth/drive.file']
 class DriveClient:
     """
     Google Drive API client for LawFlow.
+
+    Safe to share between threads: the credentials are loaded once, but the
+    googleapiclient service (an httplib2 transport, which is not
+    thread-safe) is built separately for each thread that uses the client.
     """
     
     def __init__(self, credentials_path: str, token_path: str):
         self.credentials_path = credentials_path
         self.token_path = token_path
-        self.service = None
+        self._creds = None
+        self._auth_lock = threading.Lock()
+        self._local = threading.local()
         # We don't authenticate in __init__ to allow instantiation without immediate interaction
         # But for simplicity in this app, we might want to.
         # Let's add an authenticate method that can be called explicitly or lazily.
@@ -28,9 +35,17 @@ class DriveClient:
         """
         Handles OAuth 2.0 flow with proper token persistence.
         """
-        if self.service:
+        if self._creds:
             return
 
+        with self._auth_lock:
+            if not self._creds:
+                self._creds = self._load_credentials()
+
+    def _load_credentials(self):
+        """
+        Loads the saved token, refreshing it or running the OAuth flow as needed.
+        """
         creds = None
         
         # Load existing token if available
@@ -59,7 +74,19 @@ class DriveClient:
             with open(self.token_path, 'wb') as token:
                 pickle.dump(creds, token)
         
-        self.service = build('drive', 'v3', credentials=creds)
+        return creds
+
+    @property
+    def service(self):
+        """
+        This thread's Drive service, built from the shared credentials on
+        first use (None until authenticate() has run).
+        """
+        service = getattr(self._local, 'service', None)
+        if service is None and self._creds is not None:
+            service = build('drive', 'v3', credentials=self._creds)
+            self._local.service = service
+        return service
     
     def get_or_create_folder(self, name: str, parent_id: str = None) -> str:
         """
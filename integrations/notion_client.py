@@ -3,6 +3,11 @@ from typing import List, Dict, Any, Optional
 import os
 import time
 
+# Notion accepts at most 100 children per pages.create / blocks.children.append
+MAX_BLOCKS_PER_REQUEST = 100
+# Pause between consecutive append requests (Notion averages ~3 requests/second)
+APPEND_INTERVAL_SECONDS = 0.3
+
 class NotionClient:
     """
     Notion API client for LawFlow.
@@ -20,6 +25,10 @@ class NotionClient:
     ) -> dict:
         """
         Creates a new page in the specified database.
+
+        Blocks are sent in batches: the first MAX_BLOCKS_PER_REQUEST go with
+        pages.create, the rest via one blocks.children.append per batch, so a
+        page costs ceil(len(content_blocks) / 100) requests, never one per block.
         """
         # Build properties payload
         notion_properties = {
@@ -43,8 +52,8 @@ class NotionClient:
         # Note: We can pass children (blocks) directly in create, 
         # but limited to 100. If more, we need to append later.
         
-        initial_blocks = content_blocks[:100]
-        remaining_blocks = content_blocks[100:]
+        initial_blocks = content_blocks[:MAX_BLOCKS_PER_REQUEST]
+        remaining_blocks = content_blocks[MAX_BLOCKS_PER_REQUEST:]
         
         page = self.client.pages.create(
             parent={"database_id": database_id},
@@ -65,14 +74,16 @@ class NotionClient:
     
     def _append_children(self, page_id: str, blocks: List[Dict]):
         """Helper to append blocks in chunks of 100."""
-        for i in range(0, len(blocks), 100):
-            chunk = blocks[i:i+100]
+        for i in range(0, len(blocks), MAX_BLOCKS_PER_REQUEST):
+            # Rate limit protection between requests; nothing to wait for after the last
+            if i:
+                time.sleep(APPEND_INTERVAL_SECONDS)
+            chunk = blocks[i:i + MAX_BLOCKS_PER_REQUEST]
             try:
                 self.client.blocks.children.append(
                     block_id=page_id,
                     children=chunk
                 )
-                time.sleep(0.3) # Rate limit protection
             except Exception as e:
                 print(f"Error appending blocks: {e}")
                 # Continue trying other chunks? Or fail?
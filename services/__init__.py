@@ -1,2 +1,16 @@
-from .content_service import ContentService
-from .prompt_service import PromptService
+# Re-exports resolve on first access; ContentService pulls in the Google
+# Drive client, which callers of the other services shouldn't have to load
+import importlib
+
+_EXPORTS = {
+    "ContentService": ".content_service",
+    "PromptService": ".prompt_service",
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
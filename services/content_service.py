@@ -37,12 +37,65 @@ class ContentService:
         if not self.drive_client:
             raise Exception("Google Drive credentials not configured.")
             
+        topic_folder_id = self._get_topic_folder(module_name, topic_name)
+        content_item = self._upload_file(file_obj, filename, topic_id, topic_folder_id)
+        
+        # 3. Create Database Record
+        return self.repo.create(content_item)
+
+    def upload_many(
+        self,
+        files: List,
+        topic_id: str,
+        module_name: str,
+        topic_name: str
+    ) -> List[ContentItem]:
+        """
+        Uploads several files to Google Drive and records them with one batch insert.
+
+        The Drive folders are resolved once for the whole batch. Each file is
+        a file-like object with a .name (e.g. a Streamlit UploadedFile). If an
+        upload or the insert fails, the files already uploaded are deleted
+        from Drive and the error is re-raised.
+        """
+        if not self.drive_client:
+            raise Exception("Google Drive credentials not configured.")
+
+        topic_folder_id = self._get_topic_folder(module_name, topic_name)
+        content_items = []
+        try:
+            for file_obj in files:
+                content_items.append(
+                    self._upload_file(file_obj, file_obj.name, topic_id, topic_folder_id)
+                )
+
+            # 3. Create Database Records
+            return self.repo.create_many(content_items)
+        except Exception:
+            # Don't leave the files uploaded before the failure in Drive
+            self._delete_uploaded(content_items)
+            raise
+
+    def _get_topic_folder(self, module_name: str, topic_name: str) -> str:
+        """
+        Returns the topic's Drive folder ID, creating folders as needed.
+        """
         # 1. Ensure Folder Structure Exists
         # Root -> Module -> Topic
         root_id = self.drive_client.get_or_create_folder(settings.DRIVE_ROOT_FOLDER)
         module_folder_id = self.drive_client.get_or_create_folder(module_name, parent_id=root_id)
-        topic_folder_id = self.drive_client.get_or_create_folder(topic_name, parent_id=module_folder_id)
-        
+        return self.drive_client.get_or_create_folder(topic_name, parent_id=module_folder_id)
+
+    def _upload_file(
+        self,
+        file_obj,
+        filename: str,
+        topic_id: str,
+        folder_id: str
+    ) -> ContentItem:
+        """
+        Uploads one file to Drive and builds its (unsaved) content item.
+        """
         # 2. Upload to Drive
         # Read file content
         content_bytes = file_obj.getvalue()
@@ -54,12 +107,11 @@ class ContentService:
         drive_file = self.drive_client.upload_file(
             file_content=content_bytes,
             file_name=filename,
-            folder_id=topic_folder_id,
+            folder_id=folder_id,
             mime_type=mime_type
         )
         
-        # 3. Create Database Record
-        content_item = ContentItem.create(
+        return ContentItem.create(
             topic_id=topic_id,
             content_type=ContentType.LECTURE_PDF if mime_type == 'application/pdf' else ContentType.TRANSCRIPT,
             file_name=filename,
@@ -67,8 +119,17 @@ class ContentService:
             drive_url=drive_file['url'],
             file_size_bytes=file_size
         )
-        
-        return self.repo.create(content_item)
+    
+    def _delete_uploaded(self, content_items: List[ContentItem]) -> None:
+        """
+        Trashes the Drive files of items whose batch failed (best effort).
+        """
+        for item in content_items:
+            try:
+                self.drive_client.delete_file(item.drive_file_id)
+            except Exception as e:
+                # Log but don't fail - the original error is re-raised
+                print(f"Warning: Failed to rollback Drive file {item.drive_file_id}: {e}")
     
     def get_topic_content(self, topic_id: str) -> List[ContentItem]:
         """
@@ -1,5 +1,6 @@
 import sqlite3
-from typing import List, Tuple, Optional
+from dataclasses import dataclass
+from typing import Dict, List, Set, Tuple, Optional
 from database.models import Generation, Stage, ContentType, GenerationStatus
 from database.repositories.generation_repo import GenerationRepository
 from database.repositories.content_repo import ContentRepository
@@ -8,6 +9,15 @@ from database.repositories.module_repo import ModuleRepository
 from services.prompt_service import PromptService
 
 
+@dataclass
+class StageState:
+    """Generation state of one stage of a topic, as shown on its stage card."""
+    can_generate: bool
+    missing: List[str]
+    latest: Optional[Generation]
+    history: List[Generation]
+
+
 class GenerationService:
     """
     Service layer for managing AI generation workflows.
@@ -55,31 +65,88 @@ class GenerationService:
             if not can_gen:
                 print(f"Cannot generate: {', '.join(missing)}")
         """
-        missing_requirements = []
+        # Get all uploaded content for the topic
+        uploaded_content = self.content_repo.get_for_topic(topic_id)
+        uploaded_types = {item.content_type for item in uploaded_content}
 
-        # Get required file types for this stage
-        required_files = self.prompt_service.get_required_files_for_stage(stage)
+        # MK3 has additional requirement: completed MK2 generation
+        mk2_completed = False
+        if stage == Stage.MK3:
+            completed_mk2 = self.generation_repo.get_completed_for_stage(topic_id, Stage.MK2)
+            mk2_completed = bool(completed_mk2)
 
-        # Get all uploaded content for the topic
+        missing_requirements = self._missing_requirements(stage, uploaded_types, mk2_completed)
+
+        # Return success if no missing requirements
+        can_generate = len(missing_requirements) == 0
+        return can_generate, missing_requirements
+
+    def load_topic_generation_state(self, topic_id: str) -> Dict[Stage, StageState]:
+        """
+        Get the state of every stage for a topic in two queries.
+
+        Equivalent to calling can_generate_stage and
+        get_latest_completed_generation for each stage, plus the completed
+        generations as history, but reads the topic's content and
+        generations once each instead of per stage.
+
+        Args:
+            topic_id: UUID of the topic
+
+        Returns:
+            Dict mapping each Stage to its StageState. history holds the
+            completed generations, newest version first.
+        """
         uploaded_content = self.content_repo.get_for_topic(topic_id)
         uploaded_types = {item.content_type for item in uploaded_content}
 
+        completed = {
+            stage: [g for g in generations if g.status == GenerationStatus.COMPLETED]
+            for stage, generations in self.generation_repo.get_for_topic_by_stage(topic_id).items()
+        }
+
+        states = {}
+        for stage in Stage:
+            missing = self._missing_requirements(
+                stage, uploaded_types, bool(completed[Stage.MK2])
+            )
+            states[stage] = StageState(
+                can_generate=len(missing) == 0,
+                missing=missing,
+                latest=completed[stage][0] if completed[stage] else None,
+                history=completed[stage]
+            )
+        return states
+
+    def _missing_requirements(
+        self,
+        stage: Stage,
+        uploaded_types: Set[ContentType],
+        mk2_completed: bool
+    ) -> List[str]:
+        """
+        Human-readable requirements a stage is still missing.
+
+        Args:
+            stage: The generation stage to validate
+            uploaded_types: Content types uploaded for the topic
+            mk2_completed: Whether the topic has a completed MK2 generation
+                (only consulted for MK3)
+        """
+        missing_requirements = []
+
         # Check for missing file types
-        for required_type in required_files:
+        for required_type in self.prompt_service.get_required_files_for_stage(stage):
             if required_type not in uploaded_types:
                 # Convert enum to human-readable format
                 type_name = required_type.value.replace('_', ' ').title()
                 missing_requirements.append(f"Missing {type_name}")
 
         # MK3 has additional requirement: completed MK2 generation
-        if stage == Stage.MK3:
-            completed_mk2 = self.generation_repo.get_completed_for_stage(topic_id, Stage.MK2)
-            if not completed_mk2:
-                missing_requirements.append("Missing completed MK2 generation")
+        if stage == Stage.MK3 and not mk2_completed:
+            missing_requirements.append("Missing completed MK2 generation")
 
-        # Return success if no missing requirements
-        can_generate = len(missing_requirements) == 0
-        return can_generate, missing_requirements
+        return missing_requirements
 
     def start_generation(self, topic_id: str, stage: Stage) -> Generation:
         """
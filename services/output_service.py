@@ -1,9 +1,10 @@
-from typing import Dict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Tuple
 import sqlite3
 from database.repositories.generation_repo import GenerationRepository
 from database.repositories.topic_repo import TopicRepository
 from database.repositories.module_repo import ModuleRepository
-from database.models import GenerationStatus
+from database.models import Generation, GenerationStatus, Module, Topic
 from integrations.notion_client import NotionClient
 from integrations.drive_client import DriveClient
 from integrations.markdown_converter import markdown_to_notion_blocks, validate_blocks
@@ -49,15 +50,8 @@ class OutputService:
         Processes Claude's response by saving to Notion and Drive, then updating Generation.
 
         This is an atomic operation - if any step fails, all changes are rolled back.
-
-        Orchestration flow:
-        1. Fetch Generation record to get topic_id, stage, version
-        2. Fetch Topic and Module info for naming
-        3. Convert markdown to Notion blocks
-        4. Create Notion page with structured blocks
-        5. Upload markdown backup to Drive
-        6. Update Generation record with all URLs/IDs
-        7. Mark status as COMPLETED
+        Runs process_response_stream to completion; use that directly to
+        report progress.
 
         Args:
             generation_id: The Generation ID (created by GenerationService.start_generation)
@@ -72,6 +66,55 @@ class OutputService:
                 "generation_id": "abc-123-..."
             }
 
+        Raises:
+            ValueError: If generation not found or already completed
+            Exception: If any step in the orchestration fails
+        """
+        result = None
+        for _stage, _progress, payload in self.process_response_stream(
+            generation_id, response_content, notion_database_id
+        ):
+            if payload is not None:
+                result = payload
+        return result
+
+    def process_response_stream(
+        self,
+        generation_id: str,
+        response_content: str,
+        notion_database_id: str
+    ) -> Iterator[Tuple[str, float, Optional[Dict[str, str]]]]:
+        """
+        Generator form of process_response that reports progress as it goes.
+
+        Orchestration flow:
+        1. Fetch Generation record to get topic_id, stage, version
+        2. Fetch Topic and Module info for naming
+        3. Convert markdown to Notion blocks
+        4. Create Notion page with structured blocks (NotionClient sends them
+           in batches of 100 per request, not one request per block)
+        5. Upload markdown backup to Drive
+           (4 and 5 are independent and run concurrently; if either fails,
+           whatever the other created is rolled back)
+        6. Update Generation record with all URLs/IDs
+        7. Mark status as COMPLETED
+
+        Yields (stage, progress, payload) tuples:
+            ("convert", 0.2, None) once the markdown is converted
+            ("notion" / "drive", 0.55 then 0.9, None) as each upload finishes
+            ("done", 1.0, result) with the process_response result dict
+
+        The generator should be consumed to the end; an exception raised
+        while iterating has already been rolled back. If it is abandoned
+        early (closed, or interrupted by a BaseException such as a Streamlit
+        rerun), whatever was created so far is rolled back the same way and
+        the generation is marked FAILED.
+
+        Args:
+            generation_id: The Generation ID (created by GenerationService.start_generation)
+            response_content: The markdown text pasted from Claude
+            notion_database_id: The Notion database ID to create the page in
+
         Raises:
             ValueError: If generation not found or already completed
             Exception: If any step in the orchestration fails
@@ -96,57 +139,53 @@ class OutputService:
         # Prepare variables for rollback
         notion_page_id = None
         drive_file_id = None
+        futures = {}
 
         try:
             # Step 3: Convert markdown to Notion blocks
             blocks = markdown_to_notion_blocks(response_content)
             validated_blocks = validate_blocks(blocks)
-
-            # Step 4: Create Notion page
-            page_title = f"{module.name} - {topic.name} - {generation.stage.value}"
-
-            notion_result = self.notion_client.create_page(
-                database_id=notion_database_id,
-                title=page_title,
-                properties={
-                    "Topic": topic.name,
-                    "Stage": generation.stage.value,
-                    "Version": generation.version,
-                    "Status": "Current"
-                },
-                content_blocks=validated_blocks
-            )
-
-            notion_page_id = notion_result['id']
-            notion_page_url = notion_result['url']
-
-            # Step 5: Upload markdown backup to Drive
-            # Ensure Drive folder structure exists: LawFlow/{Module}/{Topic}/
-            drive_file_name = f"{generation.stage.value}_v{generation.version}.md"
-
-            # Get or create folder structure
-            from config.settings import settings
-            root_id = self.drive_client.get_or_create_folder(settings.DRIVE_ROOT_FOLDER)
-            module_folder_id = self.drive_client.get_or_create_folder(
-                module.name,
-                parent_id=root_id
-            )
-            topic_folder_id = self.drive_client.get_or_create_folder(
-                topic.name,
-                parent_id=module_folder_id
-            )
-
-            # Upload markdown content
-            markdown_bytes = response_content.encode('utf-8')
-            drive_result = self.drive_client.upload_file(
-                file_content=markdown_bytes,
-                file_name=drive_file_name,
-                folder_id=topic_folder_id,
-                mime_type='text/markdown'
-            )
-
-            drive_file_id = drive_result['id']
-            drive_file_url = drive_result['url']
+            yield ("convert", 0.2, None)
+
+            # Steps 4 + 5: Notion page and Drive backup in parallel.
+            # Only API calls run on the workers; the DB connection stays here.
+            errors = {}
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                futures = {
+                    executor.submit(
+                        self._create_notion_page,
+                        notion_database_id, module, topic, generation, validated_blocks
+                    ): "notion",
+                    executor.submit(
+                        self._backup_to_drive,
+                        module, topic, generation, response_content
+                    ): "drive"
+                }
+
+                # Record whatever was created before surfacing any failure,
+                # so rollback can clean up the side that succeeded
+                for finished, future in enumerate(as_completed(futures), start=1):
+                    name = futures[future]
+                    error = future.exception()
+                    if error is not None:
+                        errors[name] = error
+                        continue
+                    if name == "notion":
+                        notion_page_id = future.result()['id']
+                        notion_page_url = future.result()['url']
+                    else:
+                        drive_file_id = future.result()['id']
+                        drive_file_url = future.result()['url']
+                    yield (name, 0.2 + 0.35 * finished, None)
+
+            if "notion" in errors:
+                if "drive" in errors:
+                    # Only one can be raised; keep the Drive failure diagnosable
+                    print(f"Warning: Drive backup also failed: {errors['drive']}")
+                    errors["notion"].add_note(f"Drive backup also failed: {errors['drive']!r}")
+                raise errors["notion"]
+            if "drive" in errors:
+                raise errors["drive"]
 
             # Step 6: Update Generation record with all IDs/URLs
             generation.response_content = response_content
@@ -161,14 +200,17 @@ class OutputService:
             # Commit database changes
             self.conn.commit()
 
-            # Step 7: Return the URLs dictionary
-            return {
-                "notion_url": notion_page_url,
-                "drive_url": drive_file_url,
-                "generation_id": generation_id
-            }
+        except BaseException as e:
+            # An early exit at a yield (GeneratorExit) still waits for both
+            # uploads, so pick up whatever finished without being recorded
+            for future, name in futures.items():
+                if future.cancelled() or future.exception() is not None:
+                    continue
+                if name == "notion":
+                    notion_page_id = future.result()['id']
+                else:
+                    drive_file_id = future.result()['id']
 
-        except Exception as e:
             # Rollback: Clean up any created resources
             self._rollback(notion_page_id, drive_file_id)
 
@@ -184,11 +226,86 @@ class OutputService:
                 # If we can't even mark as failed, just let it stay PENDING
                 pass
 
+            # Interruptions (generator closed, rerun, Ctrl-C) propagate as-is
+            if not isinstance(e, Exception):
+                raise
+
             # Re-raise the original exception with context
             raise Exception(
                 f"Failed to process response for generation {generation_id}: {str(e)}"
             ) from e
 
+        # Step 7: Report the URLs dictionary
+        yield ("done", 1.0, {
+            "notion_url": notion_page_url,
+            "drive_url": drive_file_url,
+            "generation_id": generation_id
+        })
+
+    def _create_notion_page(
+        self,
+        notion_database_id: str,
+        module: Module,
+        topic: Topic,
+        generation: Generation,
+        blocks: List[Dict]
+    ) -> Dict[str, str]:
+        """
+        Creates the Notion page for a generation.
+
+        Returns:
+            NotionClient.create_page result with 'id' and 'url'
+        """
+        page_title = f"{module.name} - {topic.name} - {generation.stage.value}"
+
+        return self.notion_client.create_page(
+            database_id=notion_database_id,
+            title=page_title,
+            properties={
+                "Topic": topic.name,
+                "Stage": generation.stage.value,
+                "Version": generation.version,
+                "Status": "Current"
+            },
+            content_blocks=blocks
+        )
+
+    def _backup_to_drive(
+        self,
+        module: Module,
+        topic: Topic,
+        generation: Generation,
+        response_content: str
+    ) -> Dict[str, str]:
+        """
+        Uploads the markdown response to Drive under LawFlow/{Module}/{Topic}/.
+
+        Returns:
+            DriveClient.upload_file result with 'id' and 'url'
+        """
+        drive_file_name = f"{generation.stage.value}_v{generation.version}.md"
+
+        # Get or create folder structure
+        from config.settings import settings
+        root_id = self.drive_client.get_or_create_folder(settings.DRIVE_ROOT_FOLDER)
+        module_folder_id = self.drive_client.get_or_create_folder(
+            module.name,
+            parent_id=root_id
+        )
+        topic_folder_id = self.drive_client.get_or_create_folder(
+            topic.name,
+            parent_id=module_folder_id
+        )
+
+        # Upload markdown content
+        markdown_bytes = response_content.encode('utf-8')
+        return self.drive_client.upload_file(
+            file_content=markdown_bytes,
+            file_name=drive_file_name,
+            folder_id=topic_folder_id,
+            mime_type='text/markdown'
+        )
+
     def _rollback(self, notion_page_id: str = None, drive_file_id: str = None):
         """
         Performs rollback operations by cleaning up created resources.
@@ -1,9 +1,94 @@
+import functools
+import re
+import string
 import yaml
 from pathlib import Path
-from typing import List, Dict, Optional
-from jinja2 import Template, TemplateError
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Callable, List, Dict, Mapping, Optional, Tuple
 from database.models import Stage, ContentType
 
+# jinja2 is imported lazily: the fast path renders every shipped template
+# without it, so most processes never pay its import cost
+if TYPE_CHECKING:
+    from jinja2 import Environment, Template
+
+
+# The single "{% for <var> in files %}...{% endfor %}" block every template uses
+_FOR_FILES_BLOCK = re.compile(
+    r"\{%\s*for\s+(\w+)\s+in\s+files\s*%\}(.*?)\{%\s*endfor\s*%\}",
+    re.DOTALL
+)
+# "{{ name }}" or "{{ name | upper }}" - the only expressions the fast path handles
+_SIMPLE_EXPR = re.compile(r"\{\{\s*(\w+)\s*(?:\|\s*(upper)\s*)?\}\}")
+# Filters are only precomputed for the short name fields
+_UPPER_FIELDS = ('topic_name', 'module_name')
+
+
+def _convert_snippet(
+    source: str,
+    escape: Callable[[str], str],
+    placeholder: Callable[[str, bool], Optional[str]]
+) -> Optional[str]:
+    """
+    Rewrite a Jinja2 snippet that only uses simple "{{ ... }}" expressions.
+
+    Args:
+        source: Jinja2 snippet
+        escape: Escapes literal text for the target format
+        placeholder: Maps (name, upper) to the target placeholder, or None
+            if the expression is not supported
+
+    Returns:
+        The converted string, or None if the snippet needs Jinja2
+    """
+    # Any Jinja syntax left in the literal text needs the real engine
+    literal_text = _SIMPLE_EXPR.sub('', source)
+    if any(tag in literal_text for tag in ('{{', '{%', '{#')):
+        return None
+
+    parts = []
+    last = 0
+    for match in _SIMPLE_EXPR.finditer(source):
+        name, upper = match.groups()
+        target = placeholder(name, bool(upper))
+        if target is None:
+            return None
+        parts.append(escape(source[last:match.start()]))
+        parts.append(target)
+        last = match.end()
+    parts.append(escape(source[last:]))
+    return ''.join(parts)
+
+
+def _to_string_template(source: str) -> Optional[string.Template]:
+    """
+    Convert a Jinja2 snippet into a string.Template.
+
+    "{{ x }}" becomes "${x}", "{{ x | upper }}" becomes "${x_upper}" and
+    literal "$" is doubled.
+    """
+    def placeholder(name: str, upper: bool) -> Optional[str]:
+        if not upper:
+            return '${' + name + '}'
+        if name in _UPPER_FIELDS:
+            return '${' + name + '_upper}'
+        return None
+
+    converted = _convert_snippet(source, lambda text: text.replace('$', '$$'), placeholder)
+    return string.Template(converted) if converted is not None else None
+
+
+def _to_item_format(body: str, loop_var: str) -> Optional[str]:
+    """
+    Convert the files loop body into a %-format string taking the file name.
+
+    The body may only reference the loop variable; literal "%" is doubled.
+    """
+    def placeholder(name: str, upper: bool) -> Optional[str]:
+        return '%s' if name == loop_var and not upper else None
+
+    return _convert_snippet(body, lambda text: text.replace('%', '%%'), placeholder)
+
 
 class PromptService:
     """
@@ -11,15 +96,50 @@ class PromptService:
     Handles YAML template loading, Jinja2 rendering, and template caching.
     """
 
+    # Required uploads per stage (see get_required_files_for_stage).
+    # Tuples so the same object can be handed to every caller.
+    _REQUIRED_FILES: Dict[Stage, Tuple[ContentType, ...]] = {
+        Stage.MK1: (
+            ContentType.LECTURE_PDF,
+        ),
+        Stage.MK2: (
+            ContentType.LECTURE_PDF,
+            ContentType.SOURCE_MATERIAL,
+            ContentType.TUTORIAL_PDF
+        ),
+        Stage.MK3: (
+            ContentType.LECTURE_PDF,
+            ContentType.SOURCE_MATERIAL,
+            ContentType.TUTORIAL_PDF,
+            ContentType.TRANSCRIPT
+        )
+    }
+
     def __init__(self):
         """Initialize the service with template caching."""
         self.template_cache: Dict[Stage, Dict] = {}
+        # Per-stage name/description, precomputed for get_template_info
+        self._template_info: Dict[Stage, Mapping[str, str]] = {}
+        # Per-stage (head, item_fmt, tail) pieces for the fast path
+        self._fast_render: Dict[Stage, Tuple[string.Template, str, string.Template]] = {}
+        self._use_fast_path = True
+        # Jinja2 environment, created on first compile (see _get_compiled)
+        self._env: Optional["Environment"] = None
         self._load_templates()
+        # Per-instance memo of rendered prompts; Streamlit reruns rebuild the
+        # same prompt repeatedly. Bound here so the cache dies with the service.
+        self._build_prompt_cached = functools.lru_cache(maxsize=256)(self._render_prompt)
+
+    def clear_cache(self) -> None:
+        """Drop memoized prompts, e.g. after templates are reloaded."""
+        self._build_prompt_cached.cache_clear()
 
     def _load_templates(self) -> None:
         """
         Load all YAML templates from config/prompts/ directory.
-        Templates are cached in memory for performance.
+        Templates are cached in memory for performance. Templates the fast
+        path can render are never compiled by Jinja2; the rest are compiled
+        on first use (see _get_compiled).
         """
         # Get the base directory (project root)
         base_dir = Path(__file__).parent.parent
@@ -52,6 +172,71 @@ class PromptService:
 
             # Cache the template data
             self.template_cache[stage] = template_data
+            self._template_info[stage] = MappingProxyType({
+                'name': template_data['name'],
+                'description': template_data['description']
+            })
+
+            fast_render = self._split_template(template_data['template'])
+            if fast_render is not None:
+                self._fast_render[stage] = fast_render
+
+    def _get_compiled(self, stage: Stage) -> "Template":
+        """
+        Return the compiled Jinja2 template for a stage, compiling it once.
+
+        Args:
+            stage: The generation stage
+
+        Returns:
+            Template cached under template_cache[stage]['compiled']
+        """
+        template_data = self.template_cache[stage]
+        if 'compiled' not in template_data:
+            if self._env is None:
+                from jinja2 import BaseLoader, Environment
+
+                # Templates never change at runtime, so skip Jinja2's reload checks
+                self._env = Environment(
+                    loader=BaseLoader(),
+                    autoescape=False,
+                    auto_reload=False,
+                    cache_size=-1
+                )
+            template_data['compiled'] = self._env.from_string(template_data['template'])
+        return template_data['compiled']
+
+    @staticmethod
+    def _split_template(
+        source: str
+    ) -> Optional[Tuple[string.Template, str, string.Template]]:
+        """
+        Split a template around its files loop into string.Template pieces.
+
+        Rendering head + each item + tail reproduces Jinja2's output exactly,
+        including dropping a single trailing newline as Jinja2 does by default.
+
+        Args:
+            source: Raw Jinja2 template source
+
+        Returns:
+            (head, item_fmt, tail) tuple, or None if the template needs Jinja2
+        """
+        matches = list(_FOR_FILES_BLOCK.finditer(source))
+        if len(matches) != 1:
+            return None
+        match = matches[0]
+
+        tail_source = source[match.end():]
+        if tail_source.endswith('\n'):
+            tail_source = tail_source[:-1]
+
+        head = _to_string_template(source[:match.start()])
+        item_fmt = _to_item_format(match.group(2), loop_var=match.group(1))
+        tail = _to_string_template(tail_source)
+        if head is None or item_fmt is None or tail is None:
+            return None
+        return head, item_fmt, tail
 
     def build_prompt(
         self,
@@ -82,36 +267,77 @@ class PromptService:
         if stage not in self.template_cache:
             raise ValueError(f"Unknown stage: {stage}")
 
-        # Get cached template
-        template_data = self.template_cache[stage]
-        template_string = template_data['template']
+        # MK3 requires previous_content
+        if stage == Stage.MK3:
+            if previous_content is None:
+                raise ValueError(
+                    "MK3 requires previous_content (MK2 output) to be provided"
+                )
+        else:
+            # Only MK3 uses it; dropping it keeps MK1/MK2 cache keys stable
+            previous_content = None
+
+        return self._build_prompt_cached(
+            stage,
+            topic_name,
+            module_name,
+            tuple(file_names),
+            previous_content,
+            self._use_fast_path
+        )
+
+    def _render_prompt(
+        self,
+        stage: Stage,
+        topic_name: str,
+        module_name: str,
+        file_names: Tuple[str, ...],
+        previous_content: Optional[str],
+        use_fast_path: bool
+    ) -> str:
+        """
+        Render a validated prompt. Memoized per instance by build_prompt.
+
+        Arguments mirror build_prompt, with file_names as a tuple and the
+        fast-path flag included so both are part of the cache key.
+        """
+        # Plain string substitution when the template allows it
+        if use_fast_path and stage in self._fast_render:
+            head, item_fmt, tail = self._fast_render[stage]
+            fields = {
+                'topic_name': topic_name,
+                'module_name': module_name,
+                'topic_name_upper': topic_name.upper(),
+                'module_name_upper': module_name.upper(),
+                'previous_content': previous_content or ""
+            }
+            return (
+                head.substitute(fields)
+                + ''.join([item_fmt % (name,) for name in file_names])
+                + tail.substitute(fields)
+            )
 
         # Prepare template variables
         template_vars = {
             'topic_name': topic_name,
             'module_name': module_name,
-            'files': file_names
+            'files': list(file_names)
         }
-
-        # Add previous_content for MK3
-        if stage == Stage.MK3:
-            if previous_content is None:
-                raise ValueError(
-                    "MK3 requires previous_content (MK2 output) to be provided"
-                )
+        if previous_content is not None:
             template_vars['previous_content'] = previous_content
 
         # Render template with Jinja2
+        from jinja2 import TemplateError
+
         try:
-            jinja_template = Template(template_string)
-            rendered_prompt = jinja_template.render(**template_vars)
+            rendered_prompt = self._get_compiled(stage).render(**template_vars)
             return rendered_prompt
         except TemplateError as e:
             raise TemplateError(
                 f"Failed to render template for {stage.value}: {str(e)}"
             )
 
-    def get_required_files_for_stage(self, stage: Stage) -> List[ContentType]:
+    def get_required_files_for_stage(self, stage: Stage) -> Tuple[ContentType, ...]:
         """
         Get the required file types for each generation stage.
         Helper method for validation.
@@ -120,34 +346,17 @@ class PromptService:
             stage: The generation stage
 
         Returns:
-            List of required ContentType values
+            Shared, read-only tuple of required ContentType values
 
         Raises:
             ValueError: If stage is not recognized
         """
-        requirements = {
-            Stage.MK1: [
-                ContentType.LECTURE_PDF
-            ],
-            Stage.MK2: [
-                ContentType.LECTURE_PDF,
-                ContentType.SOURCE_MATERIAL,
-                ContentType.TUTORIAL_PDF
-            ],
-            Stage.MK3: [
-                ContentType.LECTURE_PDF,
-                ContentType.SOURCE_MATERIAL,
-                ContentType.TUTORIAL_PDF,
-                ContentType.TRANSCRIPT
-            ]
-        }
-
-        if stage not in requirements:
-            raise ValueError(f"Unknown stage: {stage}")
-
-        return requirements[stage]
+        try:
+            return self._REQUIRED_FILES[stage]
+        except KeyError:
+            raise ValueError(f"Unknown stage: {stage}") from None
 
-    def get_template_info(self, stage: Stage) -> Dict[str, str]:
+    def get_template_info(self, stage: Stage) -> Mapping[str, str]:
         """
         Get metadata about a template.
 
@@ -155,16 +364,12 @@ class PromptService:
             stage: The generation stage
 
         Returns:
-            Dictionary with 'name' and 'description' keys
+            Read-only mapping with 'name' and 'description' keys
 
         Raises:
             ValueError: If stage is not recognized
         """
-        if stage not in self.template_cache:
-            raise ValueError(f"Unknown stage: {stage}")
-
-        template_data = self.template_cache[stage]
-        return {
-            'name': template_data['name'],
-            'description': template_data['description']
-        }
+        try:
+            return self._template_info[stage]
+        except KeyError:
+            raise ValueError(f"Unknown stage: {stage}") from None
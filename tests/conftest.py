@@ -2,14 +2,51 @@ import pytest
 import os
 import sys
 import sqlite3
+import itertools
+import uuid
+from datetime import datetime, timedelta
 from pathlib import Path
+from types import SimpleNamespace
 
 # Add project root to python path
 sys.path.append(str(Path(__file__).parent.parent))
 
+# Fixed epoch for the deterministic model clock below
+_CLOCK_EPOCH = datetime(2025, 1, 1, 9, 0, 0)
+
+
+@pytest.fixture(autouse=True)
+def _deterministic_ids(monkeypatch):
+    """
+    Make model IDs and timestamps reproducible within each test.
+
+    Model factories (Module.create, Generation.create, ...) draw UUIDs from a
+    counter and timestamps from a clock that ticks one second per call, so IDs
+    are stable across runs and created_at ordering matches creation order.
+    Only database.models is patched; library code keeps the real modules.
+    """
+    import database.models as models
+
+    ids = itertools.count(1)
+    ticks = itertools.count()
+
+    class _SteppingClock(datetime):
+        @classmethod
+        def utcnow(cls):
+            return _CLOCK_EPOCH + timedelta(seconds=next(ticks))
+
+    monkeypatch.setattr(models, "uuid", SimpleNamespace(uuid4=lambda: uuid.UUID(int=next(ids))))
+    monkeypatch.setattr(models, "datetime", _SteppingClock)
+
+
 @pytest.fixture
 def test_db_path(tmp_path):
-    """Create a temporary database for testing."""
+    """
+    Create a temporary database for testing.
+
+    tmp_path is unique per test, so parallel pytest-xdist workers never share
+    a database file.
+    """
     d = tmp_path / "data"
     d.mkdir()
     return d / "test_lawflow.db"
@@ -37,3 +74,31 @@ def test_db_conn(mock_settings):
 
     # Cleanup
     conn.close()
+
+
+@pytest.fixture
+def module_repo(test_db_conn):
+    """ModuleRepository bound to the test database connection."""
+    from database.repositories.module_repo import ModuleRepository
+    return ModuleRepository(test_db_conn)
+
+
+@pytest.fixture
+def topic_repo(test_db_conn):
+    """TopicRepository bound to the test database connection."""
+    from database.repositories.topic_repo import TopicRepository
+    return TopicRepository(test_db_conn)
+
+
+@pytest.fixture
+def gen_repo(test_db_conn):
+    """GenerationRepository bound to the test database connection."""
+    from database.repositories.generation_repo import GenerationRepository
+    return GenerationRepository(test_db_conn)
+
+
+@pytest.fixture
+def content_repo(test_db_conn):
+    """ContentRepository bound to the test database connection."""
+    from database.repositories.content_repo import ContentRepository
+    return ContentRepository(test_db_conn)
@@ -23,3 +23,15 @@ def test_database_initialization(mock_settings):
     with get_connection() as conn:
         cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='modules'")
         assert cursor.fetchone() is not None
+
+def test_connection_uses_wal(mock_settings):
+    """Verify connections run in WAL mode with relaxed fsync."""
+    from database.connection import get_connection
+
+    with get_connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        # synchronous: 1 == NORMAL
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+        # temp_store: 2 == MEMORY
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2
@@ -0,0 +1,40 @@
+"""
+Unit tests for ContentRepository.
+
+Tests bulk content item creation.
+"""
+from database.models import ContentItem, ContentType, Module, Topic
+
+
+class TestContentRepository:
+    """Test suite for ContentRepository"""
+
+    def test_create_many_inserts_all_items(self, module_repo, topic_repo, content_repo):
+        """Test that create_many persists every item in one call"""
+        module = module_repo.create(Module.create(name="Land Law"))
+        topic = topic_repo.create(Topic.create(module_id=module.id, name="Leases"))
+        items = [
+            ContentItem.create(
+                topic_id=topic.id,
+                content_type=ContentType.LECTURE_PDF,
+                file_name="slides.pdf",
+                file_size_bytes=100
+            ),
+            ContentItem.create(
+                topic_id=topic.id,
+                content_type=ContentType.TRANSCRIPT,
+                file_name="lecture.txt",
+                file_size_bytes=50
+            ),
+        ]
+
+        created = content_repo.create_many(items)
+
+        assert created == items
+        stored = content_repo.get_for_topic(topic.id)
+        assert {item.id for item in stored} == {item.id for item in items}
+        assert {item.content_type for item in stored} == {ContentType.LECTURE_PDF, ContentType.TRANSCRIPT}
+
+    def test_create_many_empty_list(self, content_repo):
+        """Test that an empty batch is a no-op"""
+        assert content_repo.create_many([]) == []
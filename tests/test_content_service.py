@@ -77,3 +77,53 @@ def test_delete_content(content_service):
     assert result is True
     content_service.drive_client.delete_file.assert_called_with("d1")
     content_service.repo.delete.assert_called_with("item_1")
+
+def test_upload_many(content_service):
+    content_service.repo.create_many.side_effect = lambda items: items
+
+    slides = BytesIO(b"Slides")
+    slides.name = "lecture.pdf"
+    transcript = BytesIO(b"Transcript text")
+    transcript.name = "lecture.txt"
+
+    items = content_service.upload_many(
+        files=[slides, transcript],
+        topic_id="topic_1",
+        module_name="Land Law",
+        topic_name="Registration"
+    )
+
+    # Folders resolved once for the batch, one Drive upload per file
+    assert content_service.drive_client.get_or_create_folder.call_count == 3
+    assert content_service.drive_client.upload_file.call_count == 2
+
+    # All records saved in a single batch insert
+    content_service.repo.create_many.assert_called_once_with(items)
+    content_service.repo.create.assert_not_called()
+    assert [item.file_name for item in items] == ["lecture.pdf", "lecture.txt"]
+    assert [item.content_type for item in items] == [ContentType.LECTURE_PDF, ContentType.TRANSCRIPT]
+    assert items[1].file_size_bytes == len(b"Transcript text")
+
+def test_upload_many_partial_failure_deletes_uploaded_files(content_service):
+    # Second upload fails after the first reached Drive
+    content_service.drive_client.upload_file.side_effect = [
+        {"id": "file_1", "url": "http://drive.google.com/file_1"},
+        Exception("Drive API error"),
+    ]
+
+    first = BytesIO(b"Slides")
+    first.name = "lecture.pdf"
+    second = BytesIO(b"More slides")
+    second.name = "tutorial.pdf"
+
+    with pytest.raises(Exception, match="Drive API error"):
+        content_service.upload_many(
+            files=[first, second],
+            topic_id="topic_1",
+            module_name="Land Law",
+            topic_name="Registration"
+        )
+
+    # The file uploaded before the failure is removed, nothing is recorded
+    content_service.drive_client.delete_file.assert_called_once_with("file_1")
+    content_service.repo.create_many.assert_not_called()
@@ -0,0 +1,39 @@
+"""
+Unit tests for DriveClient.
+
+Tests that the shared client gives each thread its own Drive service.
+"""
+import threading
+from unittest.mock import Mock, patch
+
+from integrations.drive_client import DriveClient
+
+
+class TestDriveClient:
+    """Test suite for DriveClient"""
+
+    def test_service_built_once_per_thread(self):
+        """Test that threads share credentials but never a service object"""
+        client = DriveClient(credentials_path="unused", token_path="unused")
+        creds = Mock()
+
+        with patch.object(DriveClient, "_load_credentials", return_value=creds) as load, \
+                patch("integrations.drive_client.build", side_effect=lambda *a, **kw: object()) as build:
+            client.authenticate()
+            main_service = client.service
+            assert client.service is main_service
+
+            services = []
+            worker = threading.Thread(target=lambda: services.append(client.service))
+            worker.start()
+            worker.join()
+
+        load.assert_called_once()
+        assert build.call_count == 2
+        assert all(call.kwargs["credentials"] is creds for call in build.call_args_list)
+        assert services[0] is not main_service
+
+    def test_service_none_before_authenticate(self):
+        """Test that no service is built without credentials"""
+        client = DriveClient(credentials_path="unused", token_path="unused")
+        assert client.service is None
@@ -106,7 +106,7 @@ class TestGenerationRepository:
 
         assert len(results) == 3
         # Should be ordered by created_at DESC (newest first)
-        assert results[0].version >= results[1].version or results[0].stage != results[1].stage
+        assert [g.id for g in results] == [gen3.id, gen2.id, gen1.id]
 
     def test_get_for_topic_isolation(self, repo):
         """Test that get_for_topic only returns generations for the specified topic"""
@@ -211,6 +211,24 @@ class TestGenerationRepository:
         results = repo.get_completed_for_stage(topic_id, Stage.MK1)
         assert results == []
 
+    def test_get_for_topic_by_stage_groups_all_stages(self, repo):
+        """Test one query returns every stage, newest version first"""
+        topic_id = "topic-grouped"
+        for stage, version in [(Stage.MK1, 1), (Stage.MK2, 1), (Stage.MK1, 2)]:
+            repo.create(Generation.create(
+                topic_id=topic_id, stage=stage, version=version, prompt_used="p"
+            ))
+        repo.create(Generation.create(
+            topic_id="other-topic", stage=Stage.MK3, version=1, prompt_used="p"
+        ))
+
+        by_stage = repo.get_for_topic_by_stage(topic_id)
+
+        assert set(by_stage) == set(Stage)
+        assert [g.version for g in by_stage[Stage.MK1]] == [2, 1]
+        assert [g.version for g in by_stage[Stage.MK2]] == [1]
+        assert by_stage[Stage.MK3] == []
+
     # ==================== VERSION TESTS ====================
 
     def test_get_next_version_no_existing(self, repo):
@@ -360,3 +360,51 @@ class TestGenerationService:
         assert latest is not None
         assert latest.version == 2  # gen2, not gen3 (which is pending)
         assert latest.status == GenerationStatus.COMPLETED
+
+    def test_load_topic_generation_state_matches_per_stage_queries(
+        self, service, sample_topic, test_db_conn
+    ):
+        """Test the batched state agrees with the per-stage service methods"""
+        for content_type in [
+            ContentType.LECTURE_PDF,
+            ContentType.SOURCE_MATERIAL,
+            ContentType.TUTORIAL_PDF
+        ]:
+            ContentRepository(test_db_conn).create(ContentItem.create(
+                topic_id=sample_topic.id,
+                content_type=content_type,
+                file_name=f"{content_type.value.lower()}.pdf",
+                file_size_bytes=1024
+            ))
+
+        repo = GenerationRepository(test_db_conn)
+        for version, status in [
+            (1, GenerationStatus.COMPLETED),
+            (2, GenerationStatus.FAILED),
+            (3, GenerationStatus.COMPLETED),
+            (4, GenerationStatus.PENDING)
+        ]:
+            gen = Generation.create(
+                topic_id=sample_topic.id,
+                stage=Stage.MK2,
+                version=version,
+                prompt_used=f"Prompt {version}"
+            )
+            gen.status = status
+            repo.create(gen)
+
+        states = service.load_topic_generation_state(sample_topic.id)
+
+        assert set(states) == set(Stage)
+        for stage, state in states.items():
+            can_generate, missing = service.can_generate_stage(sample_topic.id, stage)
+            latest = service.get_latest_completed_generation(sample_topic.id, stage)
+            assert state.can_generate == can_generate
+            assert state.missing == missing
+            assert (state.latest.id if state.latest else None) == (latest.id if latest else None)
+
+        # History holds completed generations only, newest first
+        assert [g.version for g in states[Stage.MK2].history] == [3, 1]
+        assert states[Stage.MK1].history == []
+        # MK3 is blocked only by the missing transcript, MK2 is complete
+        assert states[Stage.MK3].missing == ["Missing Transcript"]
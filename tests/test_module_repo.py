@@ -0,0 +1,53 @@
+"""
+Unit tests for ModuleRepository.
+
+Tests the single-query module/topic tree used by the sidebar
+and the version fingerprint that keys its cache.
+"""
+from database.models import Module, Topic
+
+
+class TestModuleRepository:
+    """Test suite for ModuleRepository"""
+
+    def test_get_all_with_topics_groups_and_orders(self, module_repo, topic_repo):
+        """Test that modules come back sorted with their topics sorted"""
+        tort = module_repo.create(Module.create(name="Tort Law"))
+        land = module_repo.create(Module.create(name="Land Law"))
+        topic_repo.create(Topic.create(module_id=land.id, name="Leases"))
+        topic_repo.create(Topic.create(module_id=land.id, name="Easements"))
+        topic_repo.create(Topic.create(module_id=tort.id, name="Negligence"))
+
+        tree = module_repo.get_all_with_topics()
+
+        assert [module.name for module, _ in tree] == ["Land Law", "Tort Law"]
+        assert [t.name for t in tree[0][1]] == ["Easements", "Leases"]
+        assert [t.name for t in tree[1][1]] == ["Negligence"]
+        assert all(t.module_id == land.id for t in tree[0][1])
+
+    def test_get_all_with_topics_includes_empty_modules(self, module_repo):
+        """Test that a module without topics is returned with an empty list"""
+        module = module_repo.create(Module.create(name="Contract Law"))
+
+        tree = module_repo.get_all_with_topics()
+
+        assert len(tree) == 1
+        assert tree[0][0].id == module.id
+        assert tree[0][0].name == "Contract Law"
+        assert tree[0][1] == []
+
+    def test_get_all_with_topics_empty_database(self, module_repo):
+        """Test that no modules yields an empty tree"""
+        assert module_repo.get_all_with_topics() == []
+
+    def test_get_tree_version_changes_on_writes(self, module_repo, topic_repo):
+        """Test that adding or removing a topic changes the tree version"""
+        module = module_repo.create(Module.create(name="Land Law"))
+        before = module_repo.get_tree_version()
+
+        topic = topic_repo.create(Topic.create(module_id=module.id, name="Easements"))
+        after_create = module_repo.get_tree_version()
+        assert after_create != before
+
+        topic_repo.delete(topic.id)
+        assert module_repo.get_tree_version() != after_create
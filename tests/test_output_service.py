@@ -7,43 +7,91 @@ Tests the orchestration of processing Claude's responses:
 - Error handling and rollback
 - Integration with NotionClient and DriveClient (mocked)
 """
+import re
 import pytest
-from unittest.mock import Mock, MagicMock, patch, call
-from database.repositories.generation_repo import GenerationRepository
-from database.repositories.topic_repo import TopicRepository
-from database.repositories.module_repo import ModuleRepository
+from types import MappingProxyType
+from unittest.mock import Mock
 from database.models import Generation, Topic, Module, Stage, GenerationStatus
 from services.output_service import OutputService
 
 
+# Default happy-path inputs shared by tests. _BLOCKS is handed to mocks as a
+# return value and must never be mutated by a test.
+_BLOCKS = [{'type': 'paragraph'}]
+_DB_ID = "db-123"
+_CONTENT = "Test"
+
+# Canonical client responses. Read-only so no test can mutate them for later tests.
+_NOTION_PAGE = MappingProxyType({
+    'id': 'notion-page-123',
+    'url': 'https://notion.so/page-123'
+})
+_DRIVE_FILE = MappingProxyType({
+    'id': 'drive-file-456',
+    'url': 'https://drive.google.com/file/456'
+})
+
+# Expected error messages, compiled once for pytest.raises(match=...)
+_FAILED_RX = re.compile("Failed to process response")
+_ALREADY_RX = re.compile("already completed")
+_NOT_FOUND_RX = re.compile("Generation not found")
+_TOPIC_NOT_FOUND_RX = re.compile("Topic not found")
+
+def _make_generation(topic_id, stage=Stage.MK1, version=1):
+    """
+    Return a fresh pending Generation.
+
+    Built per call (inside the test) so its ID and created_at come from the
+    deterministic clock and counter patched in by conftest's _deterministic_ids.
+    """
+    return Generation.create(
+        topic_id=topic_id,
+        stage=stage,
+        version=version,
+        prompt_used="Test prompt"
+    )
+
+
 class TestOutputService:
     """Test suite for OutputService"""
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def mock_notion_client(self):
-        """Create a mock NotionClient"""
+        """Create a mock NotionClient shared across the module (reset per test)"""
         mock = Mock()
-        mock.create_page.return_value = {
-            'id': 'notion-page-123',
-            'url': 'https://notion.so/page-123'
-        }
         # For rollback testing
         mock.client = Mock()
         mock.client.pages = Mock()
         mock.client.pages.update = Mock()
         return mock
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def mock_drive_client(self):
-        """Create a mock DriveClient"""
-        mock = Mock()
-        mock.get_or_create_folder.return_value = 'folder-id-123'
-        mock.upload_file.return_value = {
-            'id': 'drive-file-456',
-            'url': 'https://drive.google.com/file/456'
-        }
-        mock.delete_file.return_value = True
-        return mock
+        """Create a mock DriveClient shared across the module (reset per test)"""
+        return Mock()
+
+    @pytest.fixture(autouse=True)
+    def reset_clients(self, mock_notion_client, mock_drive_client):
+        """Reset the shared client mocks and reapply their canonical return values"""
+        mock_notion_client.reset_mock(return_value=True, side_effect=True)
+        mock_notion_client.create_page.return_value = _NOTION_PAGE
+
+        mock_drive_client.reset_mock(return_value=True, side_effect=True)
+        mock_drive_client.get_or_create_folder.return_value = 'folder-id-123'
+        mock_drive_client.upload_file.return_value = _DRIVE_FILE
+        mock_drive_client.delete_file.return_value = True
+
+    @pytest.fixture(autouse=True)
+    def stub_converter(self, monkeypatch):
+        """Stub markdown conversion so tests don't depend on the converter's output"""
+        monkeypatch.setattr(
+            'services.output_service.markdown_to_notion_blocks',
+            lambda markdown_text: _BLOCKS
+        )
+        monkeypatch.setattr(
+            'services.output_service.validate_blocks',
+            lambda blocks: blocks
+        )
 
     @pytest.fixture
     def service(self, test_db_conn, mock_notion_client, mock_drive_client):
@@ -55,26 +103,41 @@ class TestOutputService:
         )
 
     @pytest.fixture
-    def sample_data(self, test_db_conn):
-        """Create sample module, topic, and generation for testing"""
+    def service_no_clients(self, test_db_conn):
+        """
+        Create an OutputService whose clients fail on any use.
+
+        For validation-path tests that must raise before reaching Notion or Drive.
+        """
+        return OutputService(
+            conn=test_db_conn,
+            notion_client=Mock(spec=object),
+            drive_client=Mock(spec=object)
+        )
+
+    @pytest.fixture
+    def sample_data(self, request, test_db_conn, module_repo, topic_repo, gen_repo):
+        """
+        Create sample module, topic, and generation for testing.
+
+        Defaults to an MK1 v1 generation for Land Law / Easements. Tests can
+        vary the stage, version, and naming by parametrizing indirectly with a
+        (stage, version, module_name, topic_name) tuple.
+        """
+        stage, version, module_name, topic_name = getattr(
+            request, 'param', (Stage.MK1, 1, "Land Law", "Easements")
+        )
+
         # Create module
-        module = Module.create(name="Land Law", claude_project_name="land-law")
-        module_repo = ModuleRepository(test_db_conn)
+        module = Module.create(name=module_name, claude_project_name="land-law")
         created_module = module_repo.create(module)
 
         # Create topic
-        topic = Topic.create(module_id=created_module.id, name="Easements")
-        topic_repo = TopicRepository(test_db_conn)
+        topic = Topic.create(module_id=created_module.id, name=topic_name)
         created_topic = topic_repo.create(topic)
 
         # Create pending generation
-        generation = Generation.create(
-            topic_id=created_topic.id,
-            stage=Stage.MK1,
-            version=1,
-            prompt_used="Test prompt"
-        )
-        gen_repo = GenerationRepository(test_db_conn)
+        generation = _make_generation(created_topic.id, stage=stage, version=version)
         created_generation = gen_repo.create(generation)
 
         # Commit the test data so it's not rolled back during error tests
@@ -88,22 +151,13 @@ class TestOutputService:
 
     # ==================== SUCCESSFUL PROCESSING TESTS ====================
 
-    @patch('services.output_service.markdown_to_notion_blocks')
-    @patch('services.output_service.validate_blocks')
     def test_process_response_successful(
         self,
-        mock_validate_blocks,
-        mock_markdown_to_blocks,
         service,
         sample_data,
-        test_db_conn
+        gen_repo
     ):
         """Test successful processing of Claude's response"""
-        # Setup mocks
-        mock_blocks = [{'type': 'paragraph', 'paragraph': {'rich_text': []}}]
-        mock_markdown_to_blocks.return_value = mock_blocks
-        mock_validate_blocks.return_value = mock_blocks
-
         generation_id = sample_data['generation'].id
         response_content = "# Test Notes\n\nThis is a test response."
         notion_db_id = "notion-database-123"
@@ -120,34 +174,25 @@ class TestOutputService:
         assert 'drive_url' in result
         assert 'generation_id' in result
         assert result['generation_id'] == generation_id
-        assert result['notion_url'] == 'https://notion.so/page-123'
-        assert result['drive_url'] == 'https://drive.google.com/file/456'
+        assert result['notion_url'] is _NOTION_PAGE['url']
+        assert result['drive_url'] is _DRIVE_FILE['url']
 
         # Verify generation was updated
-        gen_repo = GenerationRepository(test_db_conn)
         updated_gen = gen_repo.get_by_id(generation_id)
         assert updated_gen.status == GenerationStatus.COMPLETED
         assert updated_gen.response_content == response_content
-        assert updated_gen.notion_page_id == 'notion-page-123'
-        assert updated_gen.notion_url == 'https://notion.so/page-123'
-        assert updated_gen.drive_backup_id == 'drive-file-456'
-        assert updated_gen.drive_backup_url == 'https://drive.google.com/file/456'
+        assert updated_gen.notion_page_id == _NOTION_PAGE['id']
+        assert updated_gen.notion_url == _NOTION_PAGE['url']
+        assert updated_gen.drive_backup_id == _DRIVE_FILE['id']
+        assert updated_gen.drive_backup_url == _DRIVE_FILE['url']
 
-    @patch('services.output_service.markdown_to_notion_blocks')
-    @patch('services.output_service.validate_blocks')
     def test_process_response_calls_notion_with_correct_params(
         self,
-        mock_validate_blocks,
-        mock_markdown_to_blocks,
         service,
         sample_data,
         mock_notion_client
     ):
         """Test that Notion client is called with correct parameters"""
-        mock_blocks = [{'type': 'paragraph'}]
-        mock_markdown_to_blocks.return_value = mock_blocks
-        mock_validate_blocks.return_value = mock_blocks
-
         generation_id = sample_data['generation'].id
         response_content = "Test content"
         notion_db_id = "notion-db-123"
@@ -158,150 +203,163 @@ class TestOutputService:
             notion_database_id=notion_db_id
         )
 
-        # Verify Notion create_page was called
-        mock_notion_client.create_page.assert_called_once()
-        call_args = mock_notion_client.create_page.call_args
+        # Verify Notion create_page was called exactly once
+        assert mock_notion_client.create_page.call_count == 1
+        page_kwargs = mock_notion_client.create_page.call_args.kwargs
 
         # Check the title includes module, topic, and stage
-        assert 'Land Law' in call_args[1]['title']
-        assert 'Easements' in call_args[1]['title']
-        assert 'MK1' in call_args[1]['title']
+        assert 'Land Law' in page_kwargs['title']
+        assert 'Easements' in page_kwargs['title']
+        assert 'MK1' in page_kwargs['title']
 
         # Check properties
-        properties = call_args[1]['properties']
+        properties = page_kwargs['properties']
         assert properties['Topic'] == 'Easements'
         assert properties['Stage'] == 'MK1'
         assert properties['Version'] == 1
 
-    @patch('services.output_service.markdown_to_notion_blocks')
-    @patch('services.output_service.validate_blocks')
     def test_process_response_calls_drive_with_correct_params(
         self,
-        mock_validate_blocks,
-        mock_markdown_to_blocks,
         service,
         sample_data,
         mock_drive_client
     ):
         """Test that Drive client is called with correct parameters"""
-        mock_blocks = [{'type': 'paragraph'}]
-        mock_markdown_to_blocks.return_value = mock_blocks
-        mock_validate_blocks.return_value = mock_blocks
-
         generation_id = sample_data['generation'].id
         response_content = "Test content"
 
         service.process_response(
             generation_id=generation_id,
             response_content=response_content,
-            notion_database_id="db-123"
+            notion_database_id=_DB_ID
         )
 
-        # Verify folder structure was created
-        assert mock_drive_client.get_or_create_folder.call_count == 3
-        calls = mock_drive_client.get_or_create_folder.call_args_list
-
-        # First call: root folder
-        assert calls[0][0][0] == 'LawFlow'
-
-        # Second call: module folder
-        assert calls[1][0][0] == 'Land Law'
-
-        # Third call: topic folder
-        assert calls[2][0][0] == 'Easements'
+        # Verify folder structure was created: root -> module -> topic
+        folder_names = [c.args[0] for c in mock_drive_client.get_or_create_folder.call_args_list]
+        assert folder_names == ['LawFlow', 'Land Law', 'Easements']
 
         # Verify file upload
-        mock_drive_client.upload_file.assert_called_once()
-        upload_args = mock_drive_client.upload_file.call_args[1]
+        assert mock_drive_client.upload_file.call_count == 1
+        upload_args = mock_drive_client.upload_file.call_args.kwargs
         assert upload_args['file_name'] == 'MK1_v1.md'
         assert upload_args['mime_type'] == 'text/markdown'
         assert b'Test content' == upload_args['file_content']
 
-    @patch('services.output_service.markdown_to_notion_blocks')
-    @patch('services.output_service.validate_blocks')
     def test_process_response_commits_transaction(
         self,
-        mock_validate_blocks,
-        mock_markdown_to_blocks,
         service,
         sample_data,
-        test_db_conn
+        gen_repo
     ):
         """Test that database transaction is committed on success"""
-        mock_blocks = [{'type': 'paragraph'}]
-        mock_markdown_to_blocks.return_value = mock_blocks
-        mock_validate_blocks.return_value = mock_blocks
-
         # Process the response
         result = service.process_response(
             generation_id=sample_data['generation'].id,
-            response_content="Test",
-            notion_database_id="db-123"
+            response_content=_CONTENT,
+            notion_database_id=_DB_ID
         )
 
         # Verify the generation was marked as completed (which requires a commit)
-        gen_repo = GenerationRepository(test_db_conn)
         updated_gen = gen_repo.get_by_id(sample_data['generation'].id)
         assert updated_gen.status == GenerationStatus.COMPLETED
         assert result is not None
 
+    def test_process_response_stream_reports_progress(
+        self,
+        service,
+        sample_data
+    ):
+        """Test that the stream yields each stage in order, ending with the result"""
+        events = list(service.process_response_stream(
+            generation_id=sample_data['generation'].id,
+            response_content=_CONTENT,
+            notion_database_id=_DB_ID
+        ))
+
+        stages = [stage for stage, _, _ in events]
+        assert stages[0] == "convert"
+        assert sorted(stages[1:3]) == ["drive", "notion"]
+        assert stages[3] == "done"
+
+        progress = [pct for _, pct, _ in events]
+        assert progress == sorted(progress)
+        assert progress[-1] == 1.0
+
+        # Only the final event carries the result
+        assert all(payload is None for _, _, payload in events[:-1])
+        assert events[-1][2]['notion_url'] is _NOTION_PAGE['url']
+        assert events[-1][2]['drive_url'] is _DRIVE_FILE['url']
+
+    def test_process_response_stream_closed_early_rolls_back(
+        self,
+        service,
+        sample_data,
+        gen_repo,
+        mock_notion_client,
+        mock_drive_client
+    ):
+        """Test that abandoning the stream after the first upload rolls back both uploads"""
+        generation_id = sample_data['generation'].id
+        stream = service.process_response_stream(
+            generation_id=generation_id,
+            response_content=_CONTENT,
+            notion_database_id=_DB_ID
+        )
+
+        assert next(stream)[0] == "convert"
+        assert next(stream)[0] in ("notion", "drive")
+        stream.close()
+
+        # The Notion page is archived and the Drive file deleted
+        mock_notion_client.client.pages.update.assert_called_once_with(
+            page_id=_NOTION_PAGE['id'],
+            archived=True
+        )
+        mock_drive_client.delete_file.assert_called_once_with(_DRIVE_FILE['id'])
+
+        failed_gen = gen_repo.get_by_id(generation_id)
+        assert failed_gen.status == GenerationStatus.FAILED
+
     # ==================== ERROR HANDLING TESTS ====================
 
-    def test_process_response_generation_not_found(self, service):
+    def test_process_response_generation_not_found(self, service_no_clients):
         """Test error when generation ID doesn't exist"""
-        with pytest.raises(ValueError, match="Generation not found"):
-            service.process_response(
+        with pytest.raises(ValueError, match=_NOT_FOUND_RX):
+            service_no_clients.process_response(
                 generation_id="non-existent-id",
-                response_content="Test",
-                notion_database_id="db-123"
+                response_content=_CONTENT,
+                notion_database_id=_DB_ID
             )
 
-    @patch('services.output_service.markdown_to_notion_blocks')
-    @patch('services.output_service.validate_blocks')
     def test_process_response_already_completed(
         self,
-        mock_validate_blocks,
-        mock_markdown_to_blocks,
-        service,
+        service_no_clients,
         sample_data,
-        test_db_conn
+        gen_repo
     ):
         """Test error when trying to process an already completed generation"""
-        mock_blocks = [{'type': 'paragraph'}]
-        mock_markdown_to_blocks.return_value = mock_blocks
-        mock_validate_blocks.return_value = mock_blocks
-
         # Mark generation as completed
-        gen_repo = GenerationRepository(test_db_conn)
         generation = sample_data['generation']
         generation.status = GenerationStatus.COMPLETED
         gen_repo.update(generation)
 
         # Try to process again
-        with pytest.raises(ValueError, match="already completed"):
-            service.process_response(
+        with pytest.raises(ValueError, match=_ALREADY_RX):
+            service_no_clients.process_response(
                 generation_id=generation.id,
-                response_content="Test",
-                notion_database_id="db-123"
+                response_content=_CONTENT,
+                notion_database_id=_DB_ID
             )
 
-    @patch('services.output_service.markdown_to_notion_blocks')
-    @patch('services.output_service.validate_blocks')
     def test_process_response_notion_failure_triggers_rollback(
         self,
-        mock_validate_blocks,
-        mock_markdown_to_blocks,
         service,
         sample_data,
-        test_db_conn,
+        gen_repo,
         mock_notion_client,
         mock_drive_client
     ):
         """Test that Notion failure triggers rollback"""
-        mock_blocks = [{'type': 'paragraph'}]
-        mock_markdown_to_blocks.return_value = mock_blocks
-        mock_validate_blocks.return_value = mock_blocks
-
         # Make Notion create_page fail
         mock_notion_client.create_page.side_effect = Exception("Notion API error")
 
@@ -309,40 +367,32 @@ class TestOutputService:
         generation_id = sample_data['generation'].id
 
         # Process should raise exception
-        with pytest.raises(Exception, match="Failed to process response"):
+        with pytest.raises(Exception, match=_FAILED_RX):
             service.process_response(
                 generation_id=generation_id,
-                response_content="Test",
-                notion_database_id="db-123"
+                response_content=_CONTENT,
+                notion_database_id=_DB_ID
             )
 
-        # Verify Drive client was NOT called (failure happened before Drive)
-        mock_drive_client.upload_file.assert_not_called()
+        # Drive backup runs concurrently with Notion, so its file must be rolled back
+        mock_drive_client.delete_file.assert_called_once_with(_DRIVE_FILE['id'])
+        mock_notion_client.client.pages.update.assert_not_called()
 
         # Verify generation exists and is marked as FAILED
         # The service commits the FAILED status separately after rollback
-        gen_repo = GenerationRepository(test_db_conn)
         failed_gen = gen_repo.get_by_id(generation_id)
         assert failed_gen is not None, "Generation should still exist after failure"
         assert failed_gen.status == GenerationStatus.FAILED, "Generation should be marked as FAILED"
 
-    @patch('services.output_service.markdown_to_notion_blocks')
-    @patch('services.output_service.validate_blocks')
     def test_process_response_drive_failure_triggers_rollback(
         self,
-        mock_validate_blocks,
-        mock_markdown_to_blocks,
         service,
         sample_data,
-        test_db_conn,
+        gen_repo,
         mock_notion_client,
         mock_drive_client
     ):
         """Test that Drive failure triggers rollback including Notion page deletion"""
-        mock_blocks = [{'type': 'paragraph'}]
-        mock_markdown_to_blocks.return_value = mock_blocks
-        mock_validate_blocks.return_value = mock_blocks
-
         # Notion succeeds, but Drive fails
         mock_drive_client.upload_file.side_effect = Exception("Drive API error")
 
@@ -350,41 +400,61 @@ class TestOutputService:
         generation_id = sample_data['generation'].id
 
         # Process should raise exception
-        with pytest.raises(Exception, match="Failed to process response"):
+        with pytest.raises(Exception, match=_FAILED_RX):
             service.process_response(
                 generation_id=generation_id,
-                response_content="Test",
-                notion_database_id="db-123"
+                response_content=_CONTENT,
+                notion_database_id=_DB_ID
             )
 
         # Verify Notion page was archived (rollback)
         mock_notion_client.client.pages.update.assert_called_once_with(
-            page_id='notion-page-123',
+            page_id=_NOTION_PAGE['id'],
             archived=True
         )
 
         # Verify generation status is FAILED (separate commit after rollback)
-        gen_repo = GenerationRepository(test_db_conn)
         failed_gen = gen_repo.get_by_id(generation_id)
         assert failed_gen is not None, "Generation should still exist after failure"
         assert failed_gen.status == GenerationStatus.FAILED, "Generation should be marked as FAILED"
 
-    @patch('services.output_service.markdown_to_notion_blocks')
-    @patch('services.output_service.validate_blocks')
+    def test_process_response_double_failure_reports_both_errors(
+        self,
+        service,
+        sample_data,
+        gen_repo,
+        mock_notion_client,
+        mock_drive_client,
+        capsys
+    ):
+        """Test that when Notion and Drive both fail, the Drive error isn't lost"""
+        mock_notion_client.create_page.side_effect = Exception("Notion API error")
+        mock_drive_client.upload_file.side_effect = Exception("Drive API error")
+
+        with pytest.raises(Exception, match=_FAILED_RX) as excinfo:
+            service.process_response(
+                generation_id=sample_data['generation'].id,
+                response_content=_CONTENT,
+                notion_database_id=_DB_ID
+            )
+
+        # Notion's error is raised, with Drive's noted on it and logged
+        cause = excinfo.value.__cause__
+        assert "Notion API error" in str(cause)
+        assert any("Drive API error" in note for note in cause.__notes__)
+        assert "Drive API error" in capsys.readouterr().out
+
+        failed_gen = gen_repo.get_by_id(sample_data['generation'].id)
+        assert failed_gen.status == GenerationStatus.FAILED
+
     def test_rollback_handles_notion_deletion_failure_gracefully(
         self,
-        mock_validate_blocks,
-        mock_markdown_to_blocks,
         service,
         sample_data,
         mock_notion_client,
         mock_drive_client
     ):
         """Test that rollback continues even if Notion deletion fails"""
-        mock_blocks = [{'type': 'paragraph'}]
-        mock_markdown_to_blocks.return_value = mock_blocks
-        mock_validate_blocks.return_value = mock_blocks
-
         # Drive upload fails
         mock_drive_client.upload_file.side_effect = Exception("Drive error")
 
@@ -392,51 +462,47 @@ class TestOutputService:
         mock_notion_client.client.pages.update.side_effect = Exception("Notion delete error")
 
         # Should still raise the original Drive error, not the rollback error
-        with pytest.raises(Exception, match="Failed to process response"):
+        with pytest.raises(Exception, match=_FAILED_RX):
             service.process_response(
                 generation_id=sample_data['generation'].id,
-                response_content="Test",
-                notion_database_id="db-123"
+                response_content=_CONTENT,
+                notion_database_id=_DB_ID
             )
 
         # Both should have been attempted
         mock_notion_client.client.pages.update.assert_called_once()
 
-    @patch('services.output_service.markdown_to_notion_blocks')
     def test_process_response_markdown_conversion_failure(
         self,
-        mock_markdown_to_blocks,
         service,
-        sample_data
+        sample_data,
+        monkeypatch
     ):
         """Test error handling when markdown conversion fails"""
         # Make markdown conversion fail
-        mock_markdown_to_blocks.side_effect = Exception("Invalid markdown")
+        def fail_conversion(markdown_text):
+            raise Exception("Invalid markdown")
+
+        monkeypatch.setattr(
+            'services.output_service.markdown_to_notion_blocks', fail_conversion
+        )
 
-        with pytest.raises(Exception, match="Failed to process response"):
+        with pytest.raises(Exception, match=_FAILED_RX):
             service.process_response(
                 generation_id=sample_data['generation'].id,
                 response_content="Bad markdown",
-                notion_database_id="db-123"
+                notion_database_id=_DB_ID
             )
 
     # ==================== DATABASE TRANSACTION TESTS ====================
 
-    @patch('services.output_service.markdown_to_notion_blocks')
-    @patch('services.output_service.validate_blocks')
     def test_process_response_rollback_on_failure(
         self,
-        mock_validate_blocks,
-        mock_markdown_to_blocks,
         service,
         sample_data,
-        test_db_conn
+        gen_repo
     ):
         """Test that database changes are rolled back on failure"""
-        mock_blocks = [{'type': 'paragraph'}]
-        mock_markdown_to_blocks.return_value = mock_blocks
-        mock_validate_blocks.return_value = mock_blocks
-
         # Make Drive upload fail after Notion succeeds
         service.drive_client.upload_file.side_effect = Exception("Drive error")
 
@@ -444,143 +510,77 @@ class TestOutputService:
         generation_id = sample_data['generation'].id
 
         # Process should raise exception
-        with pytest.raises(Exception, match="Failed to process response"):
+        with pytest.raises(Exception, match=_FAILED_RX):
             service.process_response(
                 generation_id=generation_id,
-                response_content="Test",
-                notion_database_id="db-123"
+                response_content=_CONTENT,
+                notion_database_id=_DB_ID
             )
 
         # Verify the generation was marked as FAILED after rollback
-        gen_repo = GenerationRepository(test_db_conn)
         failed_gen = gen_repo.get_by_id(generation_id)
         assert failed_gen is not None, "Generation should still exist after failure"
         assert failed_gen.status == GenerationStatus.FAILED, "Generation should be marked as FAILED"
 
     # ==================== EDGE CASES ====================
 
-    @patch('services.output_service.markdown_to_notion_blocks')
-    @patch('services.output_service.validate_blocks')
-    def test_process_response_with_mk2_stage(
+    @pytest.mark.parametrize(
+        'sample_data',
+        [
+            (Stage.MK1, 1, "Land Law", "Easements"),
+            (Stage.MK2, 1, "Tort Law", "Negligence"),
+            (Stage.MK1, 2, "Land Law", "Easements"),
+        ],
+        indirect=True,
+        ids=['mk1-v1', 'mk2-v1', 'mk1-v2']
+    )
+    def test_process_response_drive_filename_per_stage_and_version(
         self,
-        mock_validate_blocks,
-        mock_markdown_to_blocks,
         service,
-        test_db_conn,
+        sample_data,
         mock_drive_client
     ):
-        """Test processing response for MK2 stage"""
-        mock_blocks = [{'type': 'paragraph'}]
-        mock_markdown_to_blocks.return_value = mock_blocks
-        mock_validate_blocks.return_value = mock_blocks
-
-        # Create MK2 generation
-        module = Module.create(name="Tort Law")
-        module_repo = ModuleRepository(test_db_conn)
-        created_module = module_repo.create(module)
-
-        topic = Topic.create(module_id=created_module.id, name="Negligence")
-        topic_repo = TopicRepository(test_db_conn)
-        created_topic = topic_repo.create(topic)
-
-        generation = Generation.create(
-            topic_id=created_topic.id,
-            stage=Stage.MK2,
-            version=1,
-            prompt_used="MK2 prompt"
-        )
-        gen_repo = GenerationRepository(test_db_conn)
-        created_gen = gen_repo.create(generation)
+        """Test that the Drive backup filename reflects the generation's stage and version"""
+        generation = sample_data['generation']
 
         # Process
         result = service.process_response(
-            generation_id=created_gen.id,
-            response_content="MK2 content",
-            notion_database_id="db-123"
+            generation_id=generation.id,
+            response_content=f"{generation.stage.value} content",
+            notion_database_id=_DB_ID
         )
 
-        # Verify Drive filename includes MK2
-        upload_call = mock_drive_client.upload_file.call_args[1]
-        assert upload_call['file_name'] == 'MK2_v1.md'
+        # Verify Drive filename includes stage and version
+        file_name = mock_drive_client.upload_file.call_args.kwargs['file_name']
+        assert file_name == f"{generation.stage.name}_v{generation.version}.md"
 
-        assert result['generation_id'] == created_gen.id
+        assert result['generation_id'] == generation.id
 
-    @patch('services.output_service.markdown_to_notion_blocks')
-    @patch('services.output_service.validate_blocks')
-    def test_process_response_with_version_2(
-        self,
-        mock_validate_blocks,
-        mock_markdown_to_blocks,
-        service,
-        sample_data,
-        test_db_conn,
-        mock_drive_client
-    ):
-        """Test processing response for version 2 of a generation"""
-        mock_blocks = [{'type': 'paragraph'}]
-        mock_markdown_to_blocks.return_value = mock_blocks
-        mock_validate_blocks.return_value = mock_blocks
-
-        # Create version 2 generation
-        generation_v2 = Generation.create(
-            topic_id=sample_data['topic'].id,
-            stage=Stage.MK1,
-            version=2,
-            prompt_used="Version 2 prompt"
-        )
-        gen_repo = GenerationRepository(test_db_conn)
-        created_gen_v2 = gen_repo.create(generation_v2)
-
-        # Process
-        service.process_response(
-            generation_id=created_gen_v2.id,
-            response_content="Version 2 content",
-            notion_database_id="db-123"
-        )
-
-        # Verify Drive filename includes version 2
-        upload_call = mock_drive_client.upload_file.call_args[1]
-        assert upload_call['file_name'] == 'MK1_v2.md'
-
-    @patch('services.output_service.markdown_to_notion_blocks')
-    @patch('services.output_service.validate_blocks')
     def test_process_response_with_unicode_content(
         self,
-        mock_validate_blocks,
-        mock_markdown_to_blocks,
         service,
         sample_data
     ):
         """Test processing response with unicode characters"""
-        mock_blocks = [{'type': 'paragraph'}]
-        mock_markdown_to_blocks.return_value = mock_blocks
-        mock_validate_blocks.return_value = mock_blocks
-
         unicode_content = "# Notes\n\nLegal symbols: § © ® \n\nUnicode: 你好 🏛️"
 
         result = service.process_response(
             generation_id=sample_data['generation'].id,
             response_content=unicode_content,
-            notion_database_id="db-123"
+            notion_database_id=_DB_ID
         )
 
         assert result['generation_id'] == sample_data['generation'].id
 
-    def test_process_response_topic_not_found(self, service, test_db_conn):
+    def test_process_response_topic_not_found(self, service_no_clients, gen_repo):
         """Test error when topic is deleted but generation exists"""
         # Create a generation with invalid topic_id
-        generation = Generation.create(
-            topic_id="non-existent-topic",
-            stage=Stage.MK1,
-            version=1,
-            prompt_used="Test"
-        )
-        gen_repo = GenerationRepository(test_db_conn)
+        generation = _make_generation("non-existent-topic")
         created_gen = gen_repo.create(generation)
 
-        with pytest.raises(ValueError, match="Topic not found"):
-            service.process_response(
+        with pytest.raises(ValueError, match=_TOPIC_NOT_FOUND_RX):
+            service_no_clients.process_response(
                 generation_id=created_gen.id,
-                response_content="Test",
-                notion_database_id="db-123"
+                response_content=_CONTENT,
+                notion_database_id=_DB_ID
             )
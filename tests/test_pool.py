@@ -0,0 +1,55 @@
+"""
+Unit tests for ConnectionPool.
+
+Tests read/write routing, transaction handling and reader reuse.
+"""
+import sqlite3
+
+import pytest
+
+from database.models import Module
+from database.pool import ConnectionPool
+from database.repositories.module_repo import ModuleRepository
+
+
+class TestConnectionPool:
+    """Test suite for ConnectionPool"""
+
+    @pytest.fixture
+    def pool(self, mock_settings):
+        """Create a small pool over a fresh test database"""
+        pool = ConnectionPool(read_size=2)
+        yield pool
+        pool.close()
+
+    def test_write_commits_and_readers_see_it(self, pool):
+        """Test that a completed write block is visible to readers"""
+        with pool.write() as conn:
+            module = ModuleRepository(conn).create(Module.create(name="Land Law"))
+
+        with pool.read() as conn:
+            assert ModuleRepository(conn).get_by_id(module.id).name == "Land Law"
+
+    def test_write_rolls_back_on_error(self, pool):
+        """Test that a failed write block leaves nothing behind"""
+        with pytest.raises(RuntimeError):
+            with pool.write() as conn:
+                ModuleRepository(conn).create(Module.create(name="Land Law"))
+                raise RuntimeError("boom")
+
+        with pool.read() as conn:
+            assert ModuleRepository(conn).get_all() == []
+
+    def test_read_connections_are_read_only(self, pool):
+        """Test that writes through a read connection are rejected"""
+        with pool.read() as conn:
+            with pytest.raises(sqlite3.OperationalError):
+                ModuleRepository(conn).create(Module.create(name="Land Law"))
+
+    def test_readers_are_reused(self, pool):
+        """Test that borrowed readers go back to the pool"""
+        seen = set()
+        for _ in range(5):
+            with pool.read() as conn:
+                seen.add(id(conn))
+        assert len(seen) <= 2
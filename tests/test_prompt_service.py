@@ -8,7 +8,7 @@ import pytest
 from pathlib import Path
 from services.prompt_service import PromptService
 from database.models import Stage, ContentType
-from jinja2 import TemplateError
+from jinja2 import Template, TemplateError
 
 
 class TestPromptService:
@@ -302,6 +302,48 @@ class TestPromptService:
         # Cache should be the same object (not reloaded)
         assert service.template_cache is initial_cache
 
+    def test_templates_compiled_lazily_once(self, service):
+        """Test that Jinja2 compiles a template only when needed, then reuses it"""
+        params = {
+            "stage": Stage.MK1,
+            "topic_name": "Topic",
+            "module_name": "Module",
+            "file_names": ["file.pdf"]
+        }
+
+        # Fast path renders without touching Jinja2
+        service.build_prompt(**params)
+        assert 'compiled' not in service.template_cache[Stage.MK1]
+
+        service._use_fast_path = False
+        service.build_prompt(**params)
+        compiled = service.template_cache[Stage.MK1]['compiled']
+        assert isinstance(compiled, Template)
+
+        service.build_prompt(**params)
+        assert service.template_cache[Stage.MK1]['compiled'] is compiled
+
+    def test_fast_path_matches_jinja2_rendering(self, service):
+        """Test that the string.Template + %-format fast path renders exactly like Jinja2"""
+        assert set(service._fast_render) == {Stage.MK1, Stage.MK2, Stage.MK3}
+
+        for stage in [Stage.MK1, Stage.MK2, Stage.MK3]:
+            for file_names in [[], ["lecture {draft}.pdf", "Müller_notes.txt"]]:
+                params = {
+                    "stage": stage,
+                    "topic_name": "Easements {Part 1}",
+                    "module_name": "Land Law",
+                    "file_names": file_names,
+                    "previous_content": "# MK2 {notes}" if stage == Stage.MK3 else None
+                }
+
+                service._use_fast_path = True
+                fast = service.build_prompt(**params)
+                service._use_fast_path = False
+                jinja = service.build_prompt(**params)
+
+                assert fast == jinja
+
     # ==================== INTEGRATION TESTS ====================
 
     def test_full_workflow_mk1_to_mk3(self, service):
@@ -379,4 +421,22 @@ class TestPromptService:
         prompt1 = service.build_prompt(**params)
         prompt2 = service.build_prompt(**params)
 
-        assert prompt1 == prompt2
+        assert hash(prompt1) == hash(prompt2)
+        # Second call is served from the memo, not re-rendered
+        assert prompt2 is prompt1
+
+    def test_clear_cache_rerenders_prompt(self, service):
+        """Test that clear_cache drops memoized prompts"""
+        params = {
+            "stage": Stage.MK1,
+            "topic_name": "Test",
+            "module_name": "Module",
+            "file_names": ["file.pdf"]
+        }
+
+        prompt1 = service.build_prompt(**params)
+        service.clear_cache()
+        prompt2 = service.build_prompt(**params)
+
+        assert prompt2 == prompt1
+        assert prompt2 is not prompt1
@@ -0,0 +1,29 @@
+"""
+Unit tests for TopicRepository.
+
+Tests bulk topic creation.
+"""
+from database.models import Module, Topic
+
+
+class TestTopicRepository:
+    """Test suite for TopicRepository"""
+
+    def test_create_many_inserts_all_topics(self, module_repo, topic_repo):
+        """Test that create_many persists every topic in one call"""
+        module = module_repo.create(Module.create(name="Land Law"))
+        topics = [
+            Topic.create(module_id=module.id, name="Leases"),
+            Topic.create(module_id=module.id, name="Easements"),
+        ]
+
+        created = topic_repo.create_many(topics)
+
+        assert created == topics
+        stored = topic_repo.get_for_module(module.id)
+        assert [t.name for t in stored] == ["Easements", "Leases"]
+        assert {t.id for t in stored} == {t.id for t in topics}
+
+    def test_create_many_empty_list(self, topic_repo):
+        """Test that an empty batch is a no-op"""
+        assert topic_repo.create_many([]) == []
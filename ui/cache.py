@@ -0,0 +1,172 @@
+"""
+Cached database lookups shared by UI components.
+
+Streamlit reruns the whole script on every widget interaction, so hot
+read-only lookups are wrapped in st.cache_data and served from memory
+between reruns. On a miss they borrow a read connection from the shared
+ConnectionPool (get_pool), so entries are keyed on the ids alone.
+
+Anything that creates, updates or deletes modules, topics or content must
+call clear_lookup_caches() so the next rerun reads fresh rows.
+
+Authenticated Notion/Drive clients are held with st.cache_resource so the
+OAuth token load/refresh happens once per process rather than per submit;
+clear_client_caches() forces a reconnect after credentials change.
+
+Pages and components don't receive a connection: reads go through the
+caches here, database-only writes borrow get_pool().write() where they
+happen, and writes around Notion/Drive calls open their own connection
+(database.connection.get_connection) so no API call holds the pool's lock.
+"""
+
+import threading
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+import streamlit as st
+
+from config.settings import settings
+from database.models import ContentItem, Module, Topic
+from database.pool import ConnectionPool
+from database.repositories.content_repo import ContentRepository
+from database.repositories.module_repo import ModuleRepository
+from database.repositories.topic_repo import TopicRepository
+
+# API client libraries are imported inside the factories below so that pages
+# which never talk to Notion/Drive don't pay for loading them
+if TYPE_CHECKING:
+    from integrations.drive_client import DriveClient
+    from integrations.notion_client import NotionClient
+
+
+# Upper bound on staleness if an invalidation is ever missed
+_LOOKUP_TTL_SECONDS = 300
+
+
+@st.cache_resource(show_spinner=False)
+def get_pool() -> ConnectionPool:
+    """Process-wide pool of read connections plus one writer."""
+    return ConnectionPool()
+
+
+@st.cache_data(ttl=_LOOKUP_TTL_SECONDS, show_spinner=False)
+def get_topic_cached(topic_id: str) -> Optional[Topic]:
+    """Cached TopicRepository.get_by_id."""
+    with get_pool().read() as conn:
+        return TopicRepository(conn).get_by_id(topic_id)
+
+
+@st.cache_data(ttl=_LOOKUP_TTL_SECONDS, show_spinner=False)
+def get_module_cached(module_id: str) -> Optional[Module]:
+    """Cached ModuleRepository.get_by_id."""
+    with get_pool().read() as conn:
+        return ModuleRepository(conn).get_by_id(module_id)
+
+
+@st.cache_data(ttl=_LOOKUP_TTL_SECONDS, show_spinner=False)
+def get_topic_content_cached(topic_id: str) -> Tuple[ContentItem, ...]:
+    """
+    Cached ContentRepository.get_for_topic (active content for a topic).
+
+    Shared by the vault, stage cards and generation modal. A tuple, so
+    callers can't mutate the cached value in place.
+    """
+    with get_pool().read() as conn:
+        return tuple(ContentRepository(conn).get_for_topic(topic_id))
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _get_module_tree_cached(version: str) -> List[Tuple[Module, List[Topic]]]:
+    """Cached ModuleRepository.get_all_with_topics, keyed on the tree version."""
+    with get_pool().read() as conn:
+        return ModuleRepository(conn).get_all_with_topics()
+
+
+def get_module_tree() -> List[Tuple[Module, List[Topic]]]:
+    """
+    All modules with their topics, for the sidebar.
+
+    Costs one cheap version probe per rerun; the JOIN only runs when
+    modules or topics have changed.
+    """
+    with get_pool().read() as conn:
+        version = ModuleRepository(conn).get_tree_version()
+    return _get_module_tree_cached(version)
+
+
+class _TopicVersions:
+    """Per-topic change counters shared by every session in the process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions: Dict[str, int] = {}
+
+    def get(self, topic_id: str) -> int:
+        return self._versions.get(topic_id, 0)
+
+    def bump(self, topic_id: str) -> None:
+        with self._lock:
+            self._versions[topic_id] = self._versions.get(topic_id, 0) + 1
+
+
+@st.cache_resource(show_spinner=False)
+def _topic_versions() -> _TopicVersions:
+    """
+    Process-wide, like the st.cache_data entries keyed on it: a new session
+    or tab must not start back at a version whose cached entry is stale.
+    """
+    return _TopicVersions()
+
+
+def get_topic_version(topic_id: str) -> int:
+    """
+    Process-wide version counter for a topic's content and generations.
+
+    Caches keyed on it (e.g. the stage cards) miss after bump_topic_version.
+    """
+    return _topic_versions().get(topic_id)
+
+
+def bump_topic_version(topic_id: str) -> None:
+    """Mark a topic's content or generations as changed."""
+    _topic_versions().bump(topic_id)
+
+
+def clear_lookup_caches() -> None:
+    """Invalidate all cached lookups after a write."""
+    get_topic_cached.clear()
+    get_module_cached.clear()
+    get_topic_content_cached.clear()
+    _get_module_tree_cached.clear()
+
+
+@st.cache_resource(ttl="2h", show_spinner=False)
+def get_notion_client() -> "NotionClient":
+    """Shared NotionClient for the configured token."""
+    from integrations.notion_client import NotionClient
+
+    return NotionClient(settings.NOTION_TOKEN)
+
+
+@st.cache_resource(ttl="2h", show_spinner=False)
+def get_drive_client() -> "DriveClient":
+    """
+    Shared, already-authenticated DriveClient.
+
+    Only the credentials are shared across sessions: DriveClient builds a
+    separate Drive service for each thread (httplib2 isn't thread-safe).
+    A failed authenticate() raises and is not cached, so the next call retries.
+    """
+    from integrations.drive_client import DriveClient
+
+    drive_client = DriveClient(
+        credentials_path=str(settings.GOOGLE_CREDENTIALS_PATH),
+        token_path=str(settings.GOOGLE_TOKEN_PATH)
+    )
+    drive_client.authenticate()
+    return drive_client
+
+
+def clear_client_caches() -> None:
+    """Drop cached API clients so the next use reconnects."""
+    get_notion_client.clear()
+    get_drive_client.clear()
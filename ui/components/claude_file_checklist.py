@@ -9,11 +9,45 @@ Before copying a prompt, users verify that all required files are in Claude Proj
 This prevents errors from missing files during AI generation.
 """
 
+import string
+import sys
+
+import pandas as pd
 import streamlit as st
-from typing import List
+from typing import List, Optional
+
 
+_INTRO_MD = """
+Before generating content, verify that all required files are uploaded
+to your Claude Project. This ensures Claude can access the source materials
+when you paste the prompt.
+"""
+
+_WARNING_TMPL = string.Template("""
+⚠️ Please upload missing files to your Claude Project before proceeding.
+
+**How to upload files to Claude Projects:**
+1. Open [Claude.ai](https://claude.ai/)
+2. Navigate to your project: **$module**
+3. Click "Add content" → "Upload files"
+4. Upload the unchecked files above
+5. Return here and check the boxes to confirm
+""")
+
+_NEXT_STEPS_MD = """
+**Next steps:**
+1. Copy the prompt below
+2. Paste it into your Claude Project chat
+3. Claude will process the uploaded files and generate content
+4. Copy the response back to LawFlow
+"""
 
-def render_claude_file_checklist(module_name: str, file_names: List[str]) -> bool:
+
+def render_claude_file_checklist(
+    module_name: str,
+    file_names: List[str],
+    key: Optional[str] = None
+) -> bool:
     """
     Renders a checklist of files to verify in Claude Projects.
 
@@ -25,6 +59,9 @@ def render_claude_file_checklist(module_name: str, file_names: List[str]) -> boo
         module_name: The module name (e.g., "Land Law") - used to show which
             Claude Project the files should be in
         file_names: List of file names that should be uploaded to Claude Project
+        key: Optional widget key for the checklist table. Pass one per
+            topic/stage so edits made for one file list are never replayed
+            onto another (defaults to "checklist_{module_name}")
 
     Returns:
         True if user has confirmed all files are uploaded, False otherwise
@@ -41,14 +78,15 @@ def render_claude_file_checklist(module_name: str, file_names: List[str]) -> boo
 
     UI Pattern:
         1. Shows Claude Project name in info box
-        2. Lists all required files with checkboxes
+        2. Lists all required files in one table with a checkbox column
         3. Shows warning if files not confirmed
         4. Shows success message when all confirmed
         5. Returns boolean for workflow control
 
     Session State:
-        Uses unique keys per file to track confirmation state across reruns.
-        Keys format: "claude_file_check_{module_name}_{file_name}"
+        The table is a single st.data_editor keyed by `key`.
+        Per-file flags are mirrored to "claude_file_check_{module_name}_{file_name}"
+        so confirmation state persists across reruns.
     """
 
     # Step 1: Show which Claude Project to use
@@ -56,60 +94,52 @@ def render_claude_file_checklist(module_name: str, file_names: List[str]) -> boo
     st.info(f"📁 Open your Claude Project: **{module_name}**")
 
     # Helper text
-    st.markdown(
-        """
-        Before generating content, verify that all required files are uploaded
-        to your Claude Project. This ensures Claude can access the source materials
-        when you paste the prompt.
-        """
-    )
+    st.markdown(_INTRO_MD)
 
     st.markdown("**Required files in Claude Project:**")
 
-    # Step 2: Render checklist with individual checkboxes
-    all_checked = True
-    for file_name in file_names:
-        # Use unique session state key per file and module
-        # This allows state to persist across Streamlit reruns
-        checkbox_key = f"claude_file_check_{module_name}_{file_name}"
+    # Step 2: Render checklist as one editable table instead of a widget per file
+    # Keys share a prefix per module; interned so repeated session_state
+    # lookups across reruns compare by identity
+    key_prefix = f"claude_file_check_{module_name}_"
+    checkbox_keys = [sys.intern(key_prefix + file_name) for file_name in file_names]
+
+    checklist = pd.DataFrame({
+        "File": file_names,
+        "Uploaded": [st.session_state.get(key, False) for key in checkbox_keys]
+    })
+
+    edited = st.data_editor(
+        checklist,
+        column_config={
+            "File": st.column_config.TextColumn("📄 File"),
+            "Uploaded": st.column_config.CheckboxColumn(
+                "Uploaded",
+                help="Check after uploading the file to Claude Project"
+            )
+        },
+        disabled=["File"],
+        hide_index=True,
+        use_container_width=True,
+        key=key or f"checklist_{module_name}"
+    )
 
-        checked = st.checkbox(
-            f"📄 {file_name}",
-            key=checkbox_key,
-            help=f"Check this box after uploading {file_name} to Claude Project"
-        )
+    # Mirror per-file flags so state persists across reruns
+    results = [bool(checked) for checked in edited["Uploaded"]]
+    for checkbox_key, checked in zip(checkbox_keys, results):
+        st.session_state[checkbox_key] = checked
 
-        if not checked:
-            all_checked = False
+    all_checked = all(results)
 
     # Step 3: Provide feedback based on confirmation state
     if not all_checked:
-        st.warning(
-            """
-            ⚠️ Please upload missing files to your Claude Project before proceeding.
-
-            **How to upload files to Claude Projects:**
-            1. Open [Claude.ai](https://claude.ai/)
-            2. Navigate to your project: **{module}**
-            3. Click "Add content" → "Upload files"
-            4. Upload the unchecked files above
-            5. Return here and check the boxes to confirm
-            """.format(module=module_name)
-        )
+        st.warning(_WARNING_TMPL.substitute(module=module_name))
         return False
 
     # All files confirmed!
     st.success("✅ All files confirmed! You can now copy the prompt.")
 
     # Helper text for next steps
-    st.markdown(
-        """
-        **Next steps:**
-        1. Copy the prompt below
-        2. Paste it into your Claude Project chat
-        3. Claude will process the uploaded files and generate content
-        4. Copy the response back to LawFlow
-        """
-    )
+    st.markdown(_NEXT_STEPS_MD)
 
     return True
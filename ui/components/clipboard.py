@@ -14,9 +14,28 @@ Browser Requirements:
 - User gesture required - button click satisfies this ✅
 """
 
+import json
+
 import streamlit as st
 import streamlit.components.v1 as components
 
+# Optional faster JSON encoder; stdlib json produces the same literal
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Pasted responses longer than this are collapsed into a chip (see paste_from_clipboard_area)
+PASTE_CHIP_THRESHOLD = 8 * 1024
+
+
+def _to_js_string(text: str) -> str:
+    """Encode text as a JSON (and therefore JavaScript) string literal."""
+    if orjson is not None:
+        return orjson.dumps(text).decode('utf-8')
+    return json.dumps(text, ensure_ascii=False)
+
 
 def copy_to_clipboard_button(text: str, button_label: str = "📋 Copy to Clipboard"):
     """
@@ -42,15 +61,29 @@ def copy_to_clipboard_button(text: str, button_label: str = "📋 Copy to Clipbo
         ... )
     """
 
-    # Escape text for JavaScript template literal
-    # Must escape: backslashes, backticks, and dollar signs
-    escaped_text = text.replace('\\', '\\\\').replace('`', '\\`').replace('$', '\\$')
+    # Render the HTML/JS component
+    # Height=50 provides enough space for button + status message
+    components.html(_build_copy_html(text, button_label), height=50)
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _build_copy_html(text: str, button_label: str) -> str:
+    """
+    Build the button HTML/JS for copy_to_clipboard_button.
+
+    Cached per (text, button_label) so an unchanged prompt is not
+    re-encoded on every rerun; max_entries keeps large prompts bounded.
+    """
+    # Encode text as a JavaScript string literal. JSON handles quotes,
+    # backslashes, backticks, "$" and newlines; escaping "</" stops the
+    # payload from closing the surrounding <script> tag early.
+    js_literal = _to_js_string(text).replace('</', '<\\/')
 
     # JavaScript to copy to clipboard using modern Clipboard API
-    copy_js = f"""
+    return f"""
     <script>
     function copyToClipboard() {{
-        const text = `{escaped_text}`;
+        const text = {js_literal};
         navigator.clipboard.writeText(text).then(function() {{
             // Success: Show confirmation feedback
             document.getElementById('copy-status').innerText = '✓ Copied!';
@@ -76,15 +109,16 @@ def copy_to_clipboard_button(text: str, button_label: str = "📋 Copy to Clipbo
     <span id="copy-status" style="margin-left: 1rem; color: green;"></span>
     """
 
-    # Render the HTML/JS component
-    # Height=50 provides enough space for button + status message
-    components.html(copy_js, height=50)
-
 
 def paste_from_clipboard_area(key: str) -> str:
     """
     Provides a text area for pasting Claude's response.
 
+    Large pastes are collapsed: once the text exceeds PASTE_CHIP_THRESHOLD
+    characters it is moved out of the widget into session state and shown
+    as a compact "Pasted response · N chars" chip, so later reruns do not
+    ship the whole response back and forth with the browser.
+
     Args:
         key: Unique Streamlit widget key for session state
 
@@ -97,14 +131,70 @@ def paste_from_clipboard_area(key: str) -> str:
         - Supports full markdown formatting
         - Returns text for processing by generation service
 
+    Session State:
+        - key: the text area widget
+        - f"{key}_full": collapsed large response
+        - f"{key}_editing": set while the user edits a collapsed response,
+          until the edit is committed
+
     Example:
         >>> response = paste_from_clipboard_area(key="claude_response_mk1")
         >>> if response:
         ...     output_service.process_response(gen_id, response)
     """
+    full_key = f"{key}_full"
+
+    # Collapsed large paste: show a chip instead of the text
+    if full_key in st.session_state:
+        full_text = st.session_state[full_key]
+        col1, col2, col3 = st.columns([4, 1, 1])
+        with col1:
+            st.info(
+                f"📋 Pasted response · {len(full_text):,} chars, "
+                f"{full_text.count(chr(10)) + 1:,} lines"
+            )
+        with col2:
+            st.button("✏️ Edit", key=f"{key}_edit", on_click=_expand_paste, args=(key,))
+        with col3:
+            st.button("🗑️ Clear", key=f"{key}_clear", on_click=_clear_paste, args=(key,))
+        return full_text
+
     return st.text_area(
         "Paste Claude's response here:",
         height=400,
         key=key,
-        help="Copy the entire response from Claude and paste it here"
+        help="Copy the entire response from Claude and paste it here",
+        on_change=_collapse_large_paste,
+        args=(key,)
     )
+
+
+def _collapse_large_paste(key: str) -> None:
+    """on_change callback: move a large paste out of the text area widget."""
+    # Committing an edit of an expanded paste keeps it in the text area;
+    # pastes after that collapse again
+    if st.session_state.pop(f"{key}_editing", False):
+        return
+    text = st.session_state.get(key) or ""
+    if len(text) > PASTE_CHIP_THRESHOLD:
+        st.session_state[f"{key}_full"] = text
+        st.session_state[key] = ""
+
+
+def _expand_paste(key: str) -> None:
+    """on_click callback: put a collapsed paste back into the text area."""
+    st.session_state[key] = st.session_state.pop(f"{key}_full", "")
+    st.session_state[f"{key}_editing"] = True
+
+
+def _clear_paste(key: str) -> None:
+    """on_click callback: discard a collapsed paste."""
+    st.session_state.pop(f"{key}_full", None)
+    st.session_state.pop(f"{key}_editing", None)
+    st.session_state[key] = ""
+
+
+def clear_paste_area(key: str) -> None:
+    """Forget everything a paste area holds, e.g. once its response is saved."""
+    for state_key in (key, f"{key}_full", f"{key}_editing"):
+        st.session_state.pop(state_key, None)
@@ -11,26 +11,44 @@ for the generation workflow.
 """
 
 import streamlit as st
-import sqlite3
 from typing import Optional
 
+from database.connection import get_connection
 from database.models import Stage, GenerationStatus
 from services.generation_service import GenerationService
-from services.content_service import ContentService
-from services.output_service import OutputService
-from integrations.notion_client import NotionClient
-from integrations.drive_client import DriveClient
-from ui.components.clipboard import copy_to_clipboard_button, paste_from_clipboard_area
+from ui.components.clipboard import (
+    clear_paste_area,
+    copy_to_clipboard_button,
+    paste_from_clipboard_area
+)
 from ui.components.claude_file_checklist import render_claude_file_checklist
-from config.settings import settings
+from ui.cache import (
+    bump_topic_version,
+    clear_lookup_caches,
+    get_module_cached,
+    get_pool,
+    get_topic_cached,
+    get_topic_content_cached
+)
+
+
+# Characters of the prompt shown in the optional inline preview
+_PROMPT_PREVIEW_CHARS = 2000
+
+# Progress bar text for each OutputService.process_response_stream stage
+_PROGRESS_LABELS = {
+    "convert": "Converted to Notion blocks",
+    "notion": "Created Notion page",
+    "drive": "Backed up to Google Drive",
+    "done": "Saved"
+}
 
 
 def show_generation_modal(
     topic_id: str,
     stage: Stage,
-    module_name: str,
-    conn: sqlite3.Connection
-) -> bool:
+    module_name: str
+) -> None:
     """
     Orchestrates the complete generation workflow modal.
 
@@ -49,52 +67,41 @@ def show_generation_modal(
         topic_id: The topic UUID to generate for
         stage: The generation stage (MK1, MK2, or MK3)
         module_name: Module name for Claude Project reference
-        conn: Active database connection
 
-    Returns:
-        True if generation completed successfully, False otherwise
+    A successful submit swaps Step 3 for the success panel in place;
+    only its "Close & Refresh" button reruns the whole page.
 
     Session State Keys Used:
         - f"gen_id_{topic_id}_{stage.value}": Active generation ID
         - f"gen_success_{topic_id}_{stage.value}": Success flag
+        - f"gen_closed_{topic_id}_{stage.value}": Set by Close & Refresh
+        - f"files_{topic_id}": Content file names (cleared by the vault)
+        - f"response_{topic_id}_{stage.value}": Pasted response (paste area)
         - Individual file checkboxes in claude_file_checklist component
 
     Example Usage:
         In ui/pages/topic.py:
         ```
-        clicked_stage = render_stage_cards(topic.id, module.name, conn)
+        clicked_stage = render_stage_cards(topic.id, module.name)
         if clicked_stage:
-            success = show_generation_modal(
+            show_generation_modal(
                 topic_id=topic.id,
                 stage=clicked_stage,
-                module_name=module.name,
-                conn=conn
+                module_name=module.name
             )
-            if success:
-                st.balloons()
-                st.rerun()
         ```
     """
 
-    # Initialize services
-    from database.repositories.topic_repo import TopicRepository
-    from database.repositories.module_repo import ModuleRepository
-
-    gen_service = GenerationService(conn)
-    content_service = ContentService(conn)
-    topic_repo = TopicRepository(conn)
-    module_repo = ModuleRepository(conn)
-
-    # Fetch topic and module to get notion_database_id
-    topic = topic_repo.get_by_id(topic_id)
+    # Fetch topic and module to get notion_database_id (cached across reruns)
+    topic = get_topic_cached(topic_id)
     if not topic:
         st.error(f"⚠️ Topic not found: {topic_id}")
-        return False
+        return
 
-    module = module_repo.get_by_id(topic.module_id)
+    module = get_module_cached(topic.module_id)
     if not module:
         st.error(f"⚠️ Module not found for topic")
-        return False
+        return
 
     # Get notion_database_id from module
     notion_database_id = module.notion_database_id
@@ -112,11 +119,14 @@ def show_generation_modal(
 
         For now, you can update it directly in the database or contact your administrator.
         """)
-        return False
+        return
 
     # Session state keys for this generation
     gen_id_key = f"gen_id_{topic_id}_{stage.value}"
     success_key = f"gen_success_{topic_id}_{stage.value}"
+    # Widget keys use this rather than the generation ID, so a retry that
+    # starts a new generation keeps the same widgets (and the pasted text)
+    widget_suffix = f"{topic_id}_{stage.value}"
 
     # Modal title
     stage_names = {
@@ -127,36 +137,54 @@ def show_generation_modal(
     st.markdown(f"## Generate {stage_names[stage]}")
     st.divider()
 
+    # The modal is only drawn in the run of a Generate/Regenerate click, so a
+    # success flag still set here belongs to an earlier generation: forget it
+    # and start a new one rather than reopening the old success panel
+    if st.session_state.get(success_key):
+        _clear_finished_generation(gen_id_key, success_key, widget_suffix)
+    st.session_state.pop(f"gen_closed_{widget_suffix}", None)
+
     # Check for existing pending generation or create new one
     generation_id = st.session_state.get(gen_id_key)
     generation = None
 
     if generation_id:
         # Try to fetch existing generation
-        generation = gen_service.generation_repo.get_by_id(generation_id)
+        with get_pool().read() as conn:
+            generation = GenerationService(conn).generation_repo.get_by_id(generation_id)
 
     # If no generation exists or it's completed, create a new one
     if not generation or generation.status == GenerationStatus.COMPLETED:
         try:
-            generation = gen_service.start_generation(topic_id, stage)
+            with get_pool().write() as conn:
+                generation = GenerationService(conn).start_generation(topic_id, stage)
             st.session_state[gen_id_key] = generation.id
+            bump_topic_version(topic_id)
             # Clear success flag for new generation
             if success_key in st.session_state:
                 del st.session_state[success_key]
         except ValueError as e:
             st.error(f"Cannot start generation: {e}")
-            return False
+            return
 
     # ========================================
     # STEP 1: Verify Claude Project Files
     # ========================================
 
-    # Get content files for this topic
-    content_items = content_service.get_topic_content(topic_id)
-    file_names = [item.file_name for item in content_items]
+    # Get content file names for this topic; kept in session state and
+    # dropped by the vault whenever the topic's content changes
+    files_key = f"files_{topic_id}"
+    file_names = st.session_state.get(files_key)
+    if file_names is None:
+        file_names = [item.file_name for item in get_topic_content_cached(topic_id)]
+        st.session_state[files_key] = file_names
 
     # Render file checklist
-    files_confirmed = render_claude_file_checklist(module_name, file_names)
+    files_confirmed = render_claude_file_checklist(
+        module_name,
+        file_names,
+        key=f"chk_{topic_id}_{stage.value}"
+    )
 
     st.divider()
 
@@ -172,16 +200,38 @@ def show_generation_modal(
             "Claude will process the uploaded files and generate your content."
         )
 
-        # Show prompt preview (expandable for long prompts)
-        with st.expander("📄 View Full Prompt", expanded=False):
+        # Summarize the prompt instead of re-sending the full text on every rerun
+        prompt = generation.prompt_used
+        st.caption(f"📄 Prompt: {len(prompt):,} chars, {prompt.count(chr(10)) + 1:,} lines")
+        st.download_button(
+            "⬇️ Download prompt (.txt)",
+            data=prompt,
+            file_name=f"prompt_{generation.id}.txt",
+            mime="text/plain",
+            key=f"prompt_download_{widget_suffix}"
+        )
+
+        # Inline preview is opt-in and truncated
+        if st.checkbox("Show inline preview", key=f"prompt_preview_toggle_{widget_suffix}"):
+            preview = prompt
+            if len(prompt) > _PROMPT_PREVIEW_CHARS:
+                preview = prompt[:_PROMPT_PREVIEW_CHARS] + "…"
+            # Fed through session state: the key outlives the generation,
+            # so a value= default would keep showing the first prompt
+            preview_key = f"prompt_preview_{widget_suffix}"
+            st.session_state[preview_key] = preview
             st.text_area(
                 "Prompt Preview",
-                value=generation.prompt_used,
                 height=300,
                 disabled=True,
-                key=f"prompt_preview_{generation.id}",
+                key=preview_key,
                 label_visibility="collapsed"
             )
+            if len(prompt) > _PROMPT_PREVIEW_CHARS:
+                st.caption(
+                    f"Showing the first {_PROMPT_PREVIEW_CHARS:,} characters - "
+                    "download or copy the prompt for the full text."
+                )
 
         # Copy button
         copy_to_clipboard_button(
@@ -195,6 +245,49 @@ def show_generation_modal(
         # STEP 3: Paste Claude's Response
         # ========================================
 
+        _step3(topic_id, generation.id, notion_database_id, gen_id_key, success_key, widget_suffix)
+
+
+@st.fragment
+def _step3(
+    topic_id: str,
+    generation_id: str,
+    notion_database_id: str,
+    gen_id_key: str,
+    success_key: str,
+    widget_suffix: str
+) -> None:
+    """
+    Renders Step 3 (paste area and submit) as a fragment.
+
+    Editing the pasted response reruns only this fragment instead of the
+    whole page. A successful submit replaces the step with the success
+    panel, still within the fragment; the page is only rerun once the
+    user clicks "Close & Refresh".
+
+    The submit handler opens its own connection rather than borrowing the
+    pool's writer, as the Notion and Drive calls must not hold its lock.
+
+    Args:
+        topic_id: The topic being generated for
+        generation_id: The pending generation's ID
+        notion_database_id: The Notion database ID to create the page in
+        gen_id_key: Session state key holding the active generation ID
+        success_key: Session state key holding the success flag
+        widget_suffix: Stable "{topic_id}_{stage}" suffix for widget keys
+    """
+    # Set by _close_success (callbacks can't rerun the app themselves)
+    if st.session_state.pop(f"gen_closed_{widget_suffix}", False):
+        st.rerun()
+
+    if st.session_state.get(success_key):
+        _render_success(topic_id, generation_id, gen_id_key, success_key, widget_suffix)
+        return
+
+    # Cleared and replaced by the success panel once a submit succeeds
+    result = None
+    step3 = st.empty()
+    with step3.container():
         st.markdown("### Step 3: Paste Claude's Response")
         st.markdown(
             """
@@ -207,7 +300,7 @@ def show_generation_modal(
 
         # Paste area
         response_content = paste_from_clipboard_area(
-            key=f"response_{generation.id}"
+            key=f"response_{widget_suffix}"
         )
 
         # Submit button (only enabled if response is not empty)
@@ -222,33 +315,37 @@ def show_generation_modal(
             "Process & Save to Notion",
             type="primary",
             disabled=submit_disabled,
-            key=f"submit_{generation.id}",
+            key=f"submit_{widget_suffix}",
             use_container_width=True
         ):
             # Show loading state
             with st.spinner("Processing response and saving to Notion & Drive..."):
                 try:
-                    # Initialize clients
-                    notion_client = NotionClient(settings.NOTION_TOKEN)
-                    drive_client = DriveClient(
-                        credentials_path=str(settings.GOOGLE_CREDENTIALS_PATH),
-                        token_path=str(settings.GOOGLE_TOKEN_PATH)
-                    )
-                    drive_client.authenticate()
-
-                    # Process the response
-                    output_service = OutputService(conn, notion_client, drive_client)
-                    result = output_service.process_response(
-                        generation_id=generation.id,
-                        response_content=response_content,
-                        notion_database_id=notion_database_id
-                    )
-
-                    # Mark success in session state
-                    st.session_state[success_key] = True
-                    st.session_state[f"result_{generation.id}"] = result
+                    # Imported here so rendering the modal never loads the
+                    # Notion/Google client libraries; only a submit does
+                    from services.output_service import OutputService
+                    from ui.cache import get_drive_client, get_notion_client
+
+                    # Reuse clients authenticated on an earlier submit
+                    notion_client = get_notion_client()
+                    drive_client = get_drive_client()
+
+                    # Process the response, updating one progress bar in place
+                    progress = st.progress(0.0)
+                    with get_connection() as conn:
+                        output_service = OutputService(conn, notion_client, drive_client)
+                        for stage, pct, payload in output_service.process_response_stream(
+                            generation_id=generation_id,
+                            response_content=response_content,
+                            notion_database_id=notion_database_id
+                        ):
+                            progress.progress(pct, text=_PROGRESS_LABELS[stage])
+                            if payload is not None:
+                                result = payload
 
                 except Exception as e:
+                    # The generation is now FAILED; refresh the cards' history
+                    bump_topic_version(topic_id)
                     st.error(
                         f"""
                         **Failed to process response:**
@@ -264,64 +361,117 @@ def show_generation_modal(
                         **You can try again** - your response has been saved in the text area above.
                         """
                     )
-                    return False
+                    return
 
-    # ========================================
-    # SUCCESS STATE
-    # ========================================
+    if result is None:
+        return
 
-    # Check if this generation completed successfully
-    if st.session_state.get(success_key):
-        st.divider()
+    # Mark success in session state and show the panel in place of the step
+    bump_topic_version(topic_id)
+    st.session_state[success_key] = True
+    st.session_state[f"result_{generation_id}"] = result
+    step3.empty()
+    st.balloons()
+    _render_success(topic_id, generation_id, gen_id_key, success_key, widget_suffix)
 
-        # Success banner
-        st.success("✅ **Generation Complete!**")
 
-        # Retrieve result from session state
-        result = st.session_state.get(f"result_{generation.id}")
+def _render_success(
+    topic_id: str,
+    generation_id: str,
+    gen_id_key: str,
+    success_key: str,
+    widget_suffix: str
+) -> None:
+    """
+    Renders the success panel with Notion/Drive links and the Close button.
 
-        if result:
-            st.markdown(
-                """
-                Your content has been successfully generated and saved:
-                - ✓ Converted to Notion blocks
-                - ✓ Created as Notion page
-                - ✓ Backed up to Google Drive
-                """
-            )
+    Args:
+        topic_id: The topic the generation belongs to
+        generation_id: The completed generation's ID
+        gen_id_key: Session state key holding the active generation ID
+        success_key: Session state key holding the success flag
+        widget_suffix: Stable "{topic_id}_{stage}" suffix for widget keys
+    """
+    st.divider()
 
-            # Links to Notion and Drive
-            col1, col2 = st.columns(2)
-
-            with col1:
-                notion_url = result.get("notion_url")
-                if notion_url:
-                    st.markdown(f"### [📝 View in Notion]({notion_url})")
-                else:
-                    st.caption("📝 Notion URL not available")
-
-            with col2:
-                drive_url = result.get("drive_url")
-                if drive_url:
-                    st.markdown(f"### [📁 View in Drive]({drive_url})")
-                else:
-                    st.caption("📁 Drive URL not available")
-
-        # Close button
-        if st.button("Close & Refresh", type="primary", use_container_width=True):
-            # Clear session state for this generation
-            if gen_id_key in st.session_state:
-                del st.session_state[gen_id_key]
-            if success_key in st.session_state:
-                del st.session_state[success_key]
-            if f"result_{generation.id}" in st.session_state:
-                del st.session_state[f"result_{generation.id}"]
+    # Success banner
+    st.success("✅ **Generation Complete!**")
 
-            # Return True to signal completion
-            return True
+    # Retrieve result from session state
+    result = st.session_state.get(f"result_{generation_id}")
 
-        # If success state is showing, we're effectively "done"
-        return True
+    if result:
+        st.markdown(
+            """
+            Your content has been successfully generated and saved:
+            - ✓ Converted to Notion blocks
+            - ✓ Created as Notion page
+            - ✓ Backed up to Google Drive
+            """
+        )
 
-    # Still in progress
-    return False
+        # Links to Notion and Drive
+        col1, col2 = st.columns(2)
+
+        with col1:
+            notion_url = result.get("notion_url")
+            if notion_url:
+                st.markdown(f"### [📝 View in Notion]({notion_url})")
+            else:
+                st.caption("📝 Notion URL not available")
+
+        with col2:
+            drive_url = result.get("drive_url")
+            if drive_url:
+                st.markdown(f"### [📁 View in Drive]({drive_url})")
+            else:
+                st.caption("📁 Drive URL not available")
+
+    # Close button
+    st.button(
+        "Close & Refresh",
+        type="primary",
+        key=f"close_{widget_suffix}",
+        use_container_width=True,
+        on_click=_close_success,
+        args=(topic_id, gen_id_key, success_key, widget_suffix)
+    )
+
+
+def _close_success(
+    topic_id: str,
+    gen_id_key: str,
+    success_key: str,
+    widget_suffix: str
+) -> None:
+    """on_click callback: leave the success panel and refresh the page."""
+    _clear_finished_generation(gen_id_key, success_key, widget_suffix)
+
+    # Pick up anything the generation changed on the next render
+    clear_lookup_caches()
+    bump_topic_version(topic_id)
+
+    # The click only reruns the fragment; _step3 escalates to the whole page
+    st.session_state[f"gen_closed_{widget_suffix}"] = True
+
+
+def _clear_finished_generation(
+    gen_id_key: str,
+    success_key: str,
+    widget_suffix: str
+) -> None:
+    """
+    Forgets a finished generation: its ID, success flag, result and the
+    pasted response (the paste area is keyed per topic/stage, so it would
+    otherwise be prefilled next time).
+
+    Args:
+        gen_id_key: Session state key holding the active generation ID
+        success_key: Session state key holding the success flag
+        widget_suffix: Stable "{topic_id}_{stage}" suffix for widget keys
+    """
+    generation_id = st.session_state.pop(gen_id_key, None)
+    st.session_state.pop(success_key, None)
+    if generation_id:
+        st.session_state.pop(f"result_{generation_id}", None)
+    clear_paste_area(f"response_{widget_suffix}")
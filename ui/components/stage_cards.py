@@ -1,31 +1,102 @@
 import streamlit as st
-import sqlite3
-import humanize
-from typing import Optional, List, Dict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Dict, FrozenSet
 from datetime import datetime
 
 from database.models import Stage, ContentType, Generation
 from services.generation_service import GenerationService
-from services.content_service import ContentService
+from services.prompt_service import PromptService
+from ui.cache import get_pool, get_topic_content_cached, get_topic_version
+from ui.formatting import naturaltime_at, short_date
+
+
+@dataclass(frozen=True, slots=True)
+class StageMeta:
+    """Display name and description of a stage card."""
+    name: str
+    description: str
 
 
 # Stage metadata
 STAGE_METADATA = {
-    Stage.MK1: {
-        "name": "MK-1 Foundation",
-        "description": "Initial lecture summary and extraction"
-    },
-    Stage.MK2: {
-        "name": "MK-2 Tutorial Prep",
-        "description": "Detailed structured notes with source material"
-    },
-    Stage.MK3: {
-        "name": "MK-3 Exam Revision",
-        "description": "Exam-focused questions and practice materials"
-    }
+    Stage.MK1: StageMeta(
+        name="MK-1 Foundation",
+        description="Initial lecture summary and extraction"
+    ),
+    Stage.MK2: StageMeta(
+        name="MK-2 Tutorial Prep",
+        description="Detailed structured notes with source material"
+    ),
+    Stage.MK3: StageMeta(
+        name="MK-3 Exam Revision",
+        description="Exam-focused questions and practice materials"
+    )
 }
 
 
+@dataclass(frozen=True, slots=True)
+class StageKeys:
+    """Widget keys for one stage card of one topic."""
+    generate: str
+    regenerate: str
+    history: str
+
+
+@lru_cache(maxsize=256)
+def _stage_keys(stage: Stage, topic_id: str) -> StageKeys:
+    """Widget keys for a stage card, formatted once per stage and topic."""
+    return StageKeys(
+        generate=f"gen_btn_{stage.value}_{topic_id}",
+        regenerate=f"regen_btn_{stage.value}_{topic_id}",
+        history=f"history_open_{stage.value}_{topic_id}"
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def _prompt_service() -> PromptService:
+    """Shared PromptService; its templates and requirements never change at runtime."""
+    return PromptService()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_stages_data(topic_id: str, cache_key: int) -> Dict[Stage, Dict]:
+    """
+    Query the card state for all three stages, cached across reruns.
+
+    Reads through a pooled read connection, so only committed data is seen.
+
+    Args:
+        topic_id: The current topic ID
+        cache_key: Topic version from ui.cache.get_topic_version; bumped
+            after uploads, deletes and generations so the next call misses
+
+    Returns:
+        Per-stage dict with can_generate, missing (list, in display order),
+        missing_set, latest, history, history_labels (one heading per
+        history row, oldest first) and state
+    """
+    with get_pool().read() as conn:
+        stage_states = GenerationService(conn).load_topic_generation_state(topic_id)
+
+    stages_data = {}
+    for stage, stage_state in stage_states.items():
+        stages_data[stage] = {
+            "can_generate": stage_state.can_generate,
+            "missing": stage_state.missing,
+            "missing_set": frozenset(stage_state.missing),
+            "latest": stage_state.latest,
+            "history": stage_state.history,
+            # Formatted here so the dates are computed once per cache miss
+            "history_labels": [
+                f"**v{gen.version}** - {short_date(gen.created_at)}"
+                for gen in reversed(stage_state.history)
+            ],
+            "state": _determine_card_state(stage_state.latest, stage_state.can_generate)
+        }
+    return stages_data
+
+
 def _determine_card_state(
     latest_generation: Optional[Generation],
     can_generate: bool
@@ -48,87 +119,88 @@ def _determine_card_state(
         return "locked"
 
 
-def _render_requirements_section(
+def _requirements_markdown(
     stage: Stage,
-    uploaded_content: List,
-    missing_requirements: List[str]
-) -> None:
+    uploaded_types: FrozenSet[ContentType],
+    missing_set: FrozenSet[str]
+) -> str:
     """
-    Render the requirements section showing which files are uploaded.
+    Build the requirements section showing which files are uploaded.
 
     Args:
         stage: The generation stage
-        uploaded_content: List of ContentItem objects for the topic
-        missing_requirements: List of missing requirement messages
-    """
-    from services.prompt_service import PromptService
-
-    prompt_service = PromptService()
-    required_types = prompt_service.get_required_files_for_stage(stage)
+        uploaded_types: Content types uploaded for the topic
+        missing_set: Missing requirement messages, for membership tests
 
-    # Get uploaded types
-    uploaded_types = {item.content_type for item in uploaded_content}
+    Returns:
+        Markdown for the section, one line per requirement
+    """
+    required_types = _prompt_service().get_required_files_for_stage(stage)
 
-    st.markdown("**Requirements:**")
+    lines = ["**Requirements:**"]
 
     # Check each required type
     for content_type in required_types:
         type_name = content_type.value.replace('_', ' ').title()
         has_file = content_type in uploaded_types
-
-        if has_file:
-            st.markdown(f"✓ {type_name}")
-        else:
-            st.markdown(f"✗ {type_name}")
+        lines.append(f"{'✓' if has_file else '✗'} {type_name}")
 
     # For MK3, also check MK2 completion
     if stage == Stage.MK3:
-        mk2_completed = "Missing completed MK2 generation" not in missing_requirements
-        if mk2_completed:
-            st.markdown("✓ MK-2 completed")
-        else:
-            st.markdown("✗ MK-2 completed")
+        mk2_completed = "Missing completed MK2 generation" not in missing_set
+        lines.append(f"{'✓' if mk2_completed else '✗'} MK-2 completed")
+
+    return "  \n".join(lines)
+
+
+def _header_markdown(icon: str, stage: Stage) -> str:
+    """Card title and description for a stage."""
+    metadata = STAGE_METADATA[stage]
+    return f"### {icon} {metadata.name}\n\n:gray[{metadata.description}]"
+
+
+def _render_sections(*sections: str) -> None:
+    """
+    Render card sections as a single markdown element.
+
+    Sections are separated by a horizontal rule ("---", what st.divider
+    draws), so a card costs one element instead of one per line and
+    divider. An empty last section leaves a trailing rule.
+    """
+    st.markdown("\n\n---\n\n".join(sections))
 
 
 def _render_locked_card(
     stage: Stage,
-    topic_id: str,
-    missing_requirements: List[str],
-    uploaded_content: List
+    keys: StageKeys,
+    data: Dict,
+    uploaded_types: FrozenSet[ContentType]
 ) -> None:
     """
     Render a locked card (gray, requirements not met).
 
     Args:
         stage: The generation stage
-        topic_id: Current topic ID
-        missing_requirements: List of missing requirement messages
-        uploaded_content: List of ContentItem objects for the topic
+        keys: Widget keys for this stage's card
+        data: The stage's entry from _load_stages_data
+        uploaded_types: Content types uploaded for the topic
     """
-    metadata = STAGE_METADATA[stage]
-
-    st.markdown(f"### 🔒 {metadata['name']}")
-    st.caption(metadata['description'])
-    st.divider()
-
-    # Requirements section
-    _render_requirements_section(stage, uploaded_content, missing_requirements)
-
-    st.divider()
-
-    # Missing requirements
-    st.markdown("**Missing:**")
-    for requirement in missing_requirements:
-        # Clean up the message
-        clean_msg = requirement.replace("Missing ", "")
-        st.markdown(f"• {clean_msg}")
-
-    st.divider()
+    missing_requirements = data["missing"]
+
+    _render_sections(
+        _header_markdown("🔒", stage),
+        _requirements_markdown(stage, uploaded_types, data["missing_set"]),
+        "  \n".join(
+            ["**Missing:**"]
+            + [f"• {requirement.removeprefix('Missing ')}" for requirement in missing_requirements]
+        ),
+        ""
+    )
 
     # Disabled button
     st.button(
         "Generate",
-        key=f"gen_btn_{stage.value}_{topic_id}",
+        key=keys.generate,
         disabled=True,
         use_container_width=True,
         help="Upload required files to unlock"
@@ -137,42 +209,35 @@ def _render_locked_card(
 
 def _render_ready_card(
     stage: Stage,
-    topic_id: str,
-    uploaded_content: List,
-    missing_requirements: List[str]
+    keys: StageKeys,
+    data: Dict,
+    uploaded_types: FrozenSet[ContentType]
 ) -> Optional[Stage]:
     """
     Render a ready card (green, can generate).
 
     Args:
         stage: The generation stage
-        topic_id: Current topic ID
-        uploaded_content: List of ContentItem objects for the topic
-        missing_requirements: Empty list (included for consistency)
+        keys: Widget keys for this stage's card
+        data: The stage's entry from _load_stages_data
+        uploaded_types: Content types uploaded for the topic
 
     Returns:
         The stage if user clicked Generate, None otherwise
     """
-    metadata = STAGE_METADATA[stage]
-
-    st.markdown(f"### ✅ {metadata['name']}")
-    st.caption(metadata['description'])
-    st.divider()
-
-    # Requirements section
-    _render_requirements_section(stage, uploaded_content, missing_requirements)
-
-    st.divider()
+    _render_sections(
+        _header_markdown("✅", stage),
+        _requirements_markdown(stage, uploaded_types, data["missing_set"]),
+        ""
+    )
 
     # Ready message
     st.success("✅ Ready to generate!")
 
-    st.divider()
-
     # Generate button
     if st.button(
         "Generate",
-        key=f"gen_btn_{stage.value}_{topic_id}",
+        key=keys.generate,
         type="primary",
         use_container_width=True
     ):
@@ -181,84 +246,75 @@ def _render_ready_card(
     return None
 
 
+def _links_markdown(generation: Generation, show_pending: bool) -> str:
+    """Notion and Drive links for a generation, on one line."""
+    links = []
+    if generation.notion_url:
+        links.append(f"[📝 Notion]({generation.notion_url})")
+    elif show_pending:
+        links.append(":gray[📝 Notion (pending)]")
+    if generation.drive_backup_url:
+        links.append(f"[📁 Drive]({generation.drive_backup_url})")
+    elif show_pending:
+        links.append(":gray[📁 Drive (pending)]")
+    return " · ".join(links)
+
+
 def _render_generated_card(
     stage: Stage,
-    topic_id: str,
-    latest_generation: Generation,
-    generation_history: List[Generation],
-    uploaded_content: List,
-    missing_requirements: List[str]
+    keys: StageKeys,
+    data: Dict,
+    uploaded_types: FrozenSet[ContentType]
 ) -> Optional[Stage]:
     """
     Render a generated card (blue, has completed generation).
 
     Args:
         stage: The generation stage
-        topic_id: Current topic ID
-        latest_generation: Most recent completed generation
-        generation_history: All generations for this stage
-        uploaded_content: List of ContentItem objects for the topic
-        missing_requirements: Empty list (included for consistency)
+        keys: Widget keys for this stage's card
+        data: The stage's entry from _load_stages_data; uses "latest"
+            (most recent completed generation), "history" (completed
+            generations for this stage) and "history_labels", plus
+            "created_ago" (latest's relative creation time, added by
+            render_stage_cards)
+        uploaded_types: Content types uploaded for the topic
 
     Returns:
         The stage if user clicked Regenerate, None otherwise
     """
-    metadata = STAGE_METADATA[stage]
-
-    st.markdown(f"### ✨ {metadata['name']}")
-    st.caption(metadata['description'])
-    st.divider()
-
-    # Latest generation info
-    st.markdown(f"**Latest:** v{latest_generation.version}")
-    created_time = humanize.naturaltime(latest_generation.created_at)
-    st.caption(f"Created {created_time}")
-
-    st.divider()
-
-    # Links to Notion and Drive
-    col1, col2 = st.columns(2)
-
-    with col1:
-        if latest_generation.notion_url:
-            st.markdown(f"[📝 Notion]({latest_generation.notion_url})")
-        else:
-            st.caption("📝 Notion (pending)")
-
-    with col2:
-        if latest_generation.drive_backup_url:
-            st.markdown(f"[📁 Drive]({latest_generation.drive_backup_url})")
-        else:
-            st.caption("📁 Drive (pending)")
-
-    st.divider()
+    latest_generation = data["latest"]
+    generation_history = data["history"]
+
+    # Title, latest generation info and links to Notion and Drive
+    _render_sections(
+        _header_markdown("✨", stage),
+        f"**Latest:** v{latest_generation.version}\n\n:gray[Created {data['created_ago']}]",
+        _links_markdown(latest_generation, show_pending=True),
+        ""
+    )
 
     # Regenerate button
     next_version = latest_generation.version + 1
     clicked = st.button(
         f"Regenerate v{next_version}",
-        key=f"regen_btn_{stage.value}_{topic_id}",
+        key=keys.regenerate,
         type="primary",
         use_container_width=True
     )
 
-    # History expander
-    if len(generation_history) > 1:
-        with st.expander(f"📜 View history ({len(generation_history)} versions)"):
-            for gen in reversed(generation_history):  # Show oldest first
-                st.markdown(f"**v{gen.version}** - {gen.created_at.strftime('%b %d, %Y')}")
-
-                # Links for this version
-                history_col1, history_col2 = st.columns(2)
-                with history_col1:
-                    if gen.notion_url:
-                        st.markdown(f"[📝 Notion]({gen.notion_url})")
-                with history_col2:
-                    if gen.drive_backup_url:
-                        st.markdown(f"[📁 Drive]({gen.drive_backup_url})")
-
-                if gen != generation_history[-1]:  # Don't add divider after last item
-                    st.divider()
+    # History, built only while toggled open (an expander would build its
+    # rows on every rerun even when collapsed)
+    if len(generation_history) > 1 and st.toggle(
+        f"📜 View history ({len(generation_history)} versions)",
+        key=keys.history
+    ):
+        with st.container(border=True):
+            rows = []
+            # Show oldest first
+            for gen, row in zip(reversed(generation_history), data["history_labels"]):
+                links = _links_markdown(gen, show_pending=False)
+                rows.append(f"{row}  \n{links}" if links else row)
+            _render_sections(*rows)
 
     if clicked:
         return stage
@@ -266,10 +322,17 @@ def _render_generated_card(
     return None
 
 
+# Card renderer per _determine_card_state result
+_RENDERERS = {
+    "locked": _render_locked_card,
+    "ready": _render_ready_card,
+    "generated": _render_generated_card
+}
+
+
 def render_stage_cards(
     topic_id: str,
-    module_name: str,
-    conn: sqlite3.Connection
+    module_name: str
 ) -> Optional[Stage]:
     """
     Render the three-stage generation pipeline cards.
@@ -282,138 +345,36 @@ def render_stage_cards(
     Args:
         topic_id: The current topic ID
         module_name: The module name (for Claude Project reference)
-        conn: Database connection for querying
 
     Returns:
         The Stage that was clicked for generation/regeneration, or None
 
     Example:
-        stage_to_generate = render_stage_cards(topic.id, module.name, conn)
+        stage_to_generate = render_stage_cards(topic.id, module.name)
         if stage_to_generate:
             show_generation_modal(stage_to_generate)
     """
-    gen_service = GenerationService(conn)
-    content_service = ContentService(conn)
+    # Uploaded types for requirements checking, built once for all three cards
+    # (content list shared with the vault through the lookup cache)
+    uploaded_content = get_topic_content_cached(topic_id)
+    uploaded_types = frozenset(item.content_type for item in uploaded_content)
 
-    # Get uploaded content for requirements checking
-    uploaded_content = content_service.get_topic_content(topic_id)
+    # State for all three stages, re-queried only when the topic changes
+    stages_data = _load_stages_data(topic_id, get_topic_version(topic_id))
 
-    # Query state for all three stages
-    stages_data = {}
-    for stage in [Stage.MK1, Stage.MK2, Stage.MK3]:
-        can_gen, missing = gen_service.can_generate_stage(topic_id, stage)
-        latest = gen_service.get_latest_completed_generation(topic_id, stage)
-        history = gen_service.get_generation_history(topic_id, stage)
-
-        stages_data[stage] = {
-            "can_generate": can_gen,
-            "missing": missing,
-            "latest": latest,
-            "history": history,
-            "state": _determine_card_state(latest, can_gen)
-        }
-
-    # Render three columns
-    col1, col2, col3 = st.columns(3)
+    # Relative times are rendered fresh (stages_data may be cached) but
+    # all against one "now"
+    now = datetime.utcnow()
 
+    # One column per stage; each card picks its renderer from its state
     clicked_stage = None
-
-    # Render MK1 card
-    with col1:
-        with st.container():
-            data = stages_data[Stage.MK1]
-
-            if data["state"] == "locked":
-                _render_locked_card(
-                    Stage.MK1,
-                    topic_id,
-                    data["missing"],
-                    uploaded_content
-                )
-            elif data["state"] == "ready":
-                result = _render_ready_card(
-                    Stage.MK1,
-                    topic_id,
-                    uploaded_content,
-                    data["missing"]
-                )
-                if result:
-                    clicked_stage = result
-            else:  # generated
-                result = _render_generated_card(
-                    Stage.MK1,
-                    topic_id,
-                    data["latest"],
-                    data["history"],
-                    uploaded_content,
-                    data["missing"]
-                )
-                if result:
-                    clicked_stage = result
-
-    # Render MK2 card
-    with col2:
-        with st.container():
-            data = stages_data[Stage.MK2]
-
-            if data["state"] == "locked":
-                _render_locked_card(
-                    Stage.MK2,
-                    topic_id,
-                    data["missing"],
-                    uploaded_content
-                )
-            elif data["state"] == "ready":
-                result = _render_ready_card(
-                    Stage.MK2,
-                    topic_id,
-                    uploaded_content,
-                    data["missing"]
-                )
-                if result:
-                    clicked_stage = result
-            else:  # generated
-                result = _render_generated_card(
-                    Stage.MK2,
-                    topic_id,
-                    data["latest"],
-                    data["history"],
-                    uploaded_content,
-                    data["missing"]
-                )
-                if result:
-                    clicked_stage = result
-
-    # Render MK3 card
-    with col3:
-        with st.container():
-            data = stages_data[Stage.MK3]
-
-            if data["state"] == "locked":
-                _render_locked_card(
-                    Stage.MK3,
-                    topic_id,
-                    data["missing"],
-                    uploaded_content
-                )
-            elif data["state"] == "ready":
-                result = _render_ready_card(
-                    Stage.MK3,
-                    topic_id,
-                    uploaded_content,
-                    data["missing"]
-                )
-                if result:
-                    clicked_stage = result
-            else:  # generated
-                result = _render_generated_card(
-                    Stage.MK3,
-                    topic_id,
-                    data["latest"],
-                    data["history"],
-                    uploaded_content,
-                    data["missing"]
-                )
+    for stage, col in zip((Stage.MK1, Stage.MK2, Stage.MK3), st.columns(3)):
+        with col:
+            with st.container():
+                data = stages_data[stage]
+                if data["latest"] is not None:
+                    data = {**data, "created_ago": naturaltime_at(data["latest"].created_at, now)}
+                result = _RENDERERS[data["state"]](stage, _stage_keys(stage, topic_id), data, uploaded_types)
                 if result:
                     clicked_stage = result
 
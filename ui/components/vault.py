@@ -1,47 +1,96 @@
 import streamlit as st
 import humanize
-from services.content_service import ContentService
+from datetime import datetime
+from database.connection import get_connection
 from database.models import ContentType
+from services.content_service import ContentService
+from ui.cache import (
+    bump_topic_version,
+    clear_lookup_caches,
+    get_topic_content_cached
+)
+from ui.formatting import naturaltime_at
+
+# Content rows rendered per "Load more" step
+VAULT_PAGE_SIZE = 25
 
-def render_vault(conn, module, topic):
+@st.fragment
+def render_vault(module, topic):
     """
     Renders the Content Vault for a specific topic.
+
+    Runs as a fragment: uploads, deletes and paging rerun only the vault.
+    The rest of the page is rerun only when the set of uploaded content
+    types changes, since that is all the stage cards depend on.
+    Uploads and deletes call Drive, so they use their own connection
+    rather than the pool's writer (see ConnectionPool).
     """
     st.subheader("📂 Content Vault")
-    
-    service = ContentService(conn)
+
+    # Set by _delete_item (callbacks can't rerun the app themselves)
+    if st.session_state.pop(f"vault_full_rerun_{topic.id}", False):
+        st.rerun()
+    delete_message = st.session_state.pop(f"vault_delete_msg_{topic.id}", None)
+    if delete_message == "deleted":
+        st.success("Deleted!")
+    elif delete_message == "failed":
+        st.error("Failed to delete")
     
     # --- File Uploader ---
     with st.expander("Upload New Content", expanded=False):
-        uploaded_file = st.file_uploader(
-            "Choose a file", 
+        uploaded_files = st.file_uploader(
+            "Choose files", 
             type=['pdf', 'txt'],
+            accept_multiple_files=True,
             help="Upload lecture slides (PDF) or transcripts (TXT)"
         )
         
-        if uploaded_file is not None:
+        if uploaded_files:
             if st.button("Upload & Process", type="primary"):
                 with st.spinner("Uploading to Drive..."):
                     try:
-                        service.upload_content(
-                            file_obj=uploaded_file,
-                            filename=uploaded_file.name,
-                            topic_id=topic.id,
-                            module_name=module.name,
-                            topic_name=topic.name
-                        )
-                        st.success(f"Successfully uploaded {uploaded_file.name}!")
-                        st.rerun()
+                        types_before = _uploaded_types(topic.id)
+                        # Own connection rather than the pool's writer: the
+                        # Drive uploads run first, outside any transaction, and
+                        # the batch insert then commits once
+                        with get_connection() as conn:
+                            ContentService(conn).upload_many(
+                                files=uploaded_files,
+                                topic_id=topic.id,
+                                module_name=module.name,
+                                topic_name=topic.name
+                            )
+                        names = ", ".join(f.name for f in uploaded_files)
+                        st.success(f"Successfully uploaded {names}!")
+                        if _after_content_change(topic.id, types_before):
+                            st.rerun()
                     except Exception as e:
                         st.error(f"Upload failed: {str(e)}")
 
     # --- Content List ---
-    content_items = service.get_topic_content(topic.id)
+    # Cached until an upload/delete calls clear_lookup_caches()
+    content_items = get_topic_content_cached(topic.id)
     
     if not content_items:
         st.info("No content uploaded yet. Upload slides to get started!")
     else:
-        for item in content_items:
+        # Only the first `page` pages get widgets; "Load more" extends it
+        page_key = f"vault_page_{topic.id}"
+        shown = st.session_state.get(page_key, 1) * VAULT_PAGE_SIZE
+
+        # Format sizes, ages (all relative to one "now") and delete
+        # button keys up front
+        now = datetime.utcnow()
+        rows = [
+            (
+                item,
+                humanize.naturalsize(item.file_size_bytes),
+                naturaltime_at(item.uploaded_at, now),
+                f"del_{item.id}"
+            )
+            for item in content_items[:shown]
+        ]
+        for item, size_str, time_str, delete_key in rows:
             with st.container():
                 col1, col2, col3, col4 = st.columns([3, 2, 2, 1])
                 
@@ -50,22 +99,71 @@ def render_vault(conn, module, topic):
                     st.markdown(f"**{icon} {item.file_name}**")
                     
                 with col2:
-                    st.caption(f"{humanize.naturalsize(item.file_size_bytes)}")
+                    st.caption(size_str)
                     
                 with col3:
-                    st.caption(f"Uploaded {humanize.naturaltime(item.uploaded_at)}")
+                    st.caption(f"Uploaded {time_str}")
                     
                 with col4:
                     # Actions
                     if item.drive_url:
                         st.markdown(f"[View]({item.drive_url})")
                     
-                    # Delete button (using a unique key)
-                    if st.button("🗑️", key=f"del_{item.id}", help="Delete"):
-                        if service.delete_content(item.id):
-                            st.success("Deleted!")
-                            st.rerun()
-                        else:
-                            st.error("Failed to delete")
+                    # Delete button (using a unique key). Deleting in the
+                    # callback means the list above is drawn without the row.
+                    st.button(
+                        "🗑️",
+                        key=delete_key,
+                        help="Delete",
+                        on_click=_delete_item,
+                        args=(topic.id, item.id)
+                    )
                 
                 st.divider()
+
+        remaining = len(content_items) - shown
+        if remaining > 0:
+            st.button(
+                f"Load more ({remaining} remaining)",
+                key=f"vault_more_{topic.id}",
+                on_click=_load_more,
+                args=(page_key,)
+            )
+
+
+def _uploaded_types(topic_id: str) -> frozenset:
+    """Content types currently uploaded for a topic (from the lookup cache)."""
+    return frozenset(item.content_type for item in get_topic_content_cached(topic_id))
+
+
+def _after_content_change(topic_id: str, types_before: frozenset) -> bool:
+    """
+    Invalidate what depends on a topic's content after an upload or delete.
+
+    Returns:
+        True if the uploaded content types changed, i.e. the stage cards'
+        requirements may have changed and the whole page should rerun
+    """
+    clear_lookup_caches()
+    bump_topic_version(topic_id)
+    st.session_state.pop(f"files_{topic_id}", None)
+    return _uploaded_types(topic_id) != types_before
+
+
+def _delete_item(topic_id: str, content_id: str) -> None:
+    """on_click callback: delete a content item before the vault redraws."""
+    types_before = _uploaded_types(topic_id)
+    # Own connection: the Drive delete mustn't hold the pool's writer
+    with get_connection() as conn:
+        deleted = ContentService(conn).delete_content(content_id)
+    if not deleted:
+        st.session_state[f"vault_delete_msg_{topic_id}"] = "failed"
+        return
+    st.session_state[f"vault_delete_msg_{topic_id}"] = "deleted"
+    if _after_content_change(topic_id, types_before):
+        st.session_state[f"vault_full_rerun_{topic_id}"] = True
+
+
+def _load_more(page_key: str) -> None:
+    """on_click callback: show one more page of vault items."""
+    st.session_state[page_key] = st.session_state.get(page_key, 1) + 1
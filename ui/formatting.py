@@ -0,0 +1,29 @@
+"""
+Display formatting shared by UI components.
+
+Timestamps are stored with datetime.utcnow() and come back from SQLite as
+strings, so relative times are computed against a UTC "now" captured once
+per render; every row on the page is then relative to the same instant.
+"""
+
+from datetime import datetime
+from typing import Union
+
+import humanize
+
+
+def as_datetime(value: Union[datetime, str]) -> datetime:
+    """Parse a timestamp read back from SQLite (datetimes pass through)."""
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+
+def short_date(value: Union[datetime, str]) -> str:
+    """A stored timestamp as a short date, e.g. "Jan 01, 2025"."""
+    return as_datetime(value).strftime('%b %d, %Y')
+
+
+def naturaltime_at(value: Union[datetime, str], now: datetime) -> str:
+    """humanize.naturaltime of a stored UTC timestamp, relative to `now`."""
+    return humanize.naturaltime(as_datetime(value), when=now)
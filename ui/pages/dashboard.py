@@ -1,6 +1,6 @@
 import streamlit as st
 
-def render(conn):
+def render():
     st.title("Dashboard")
     st.info("Welcome to LawFlow! Select a module from the sidebar to get started.")
     
@@ -1,12 +1,18 @@
 import streamlit as st
 from config.settings import settings
+from ui.cache import clear_client_caches
 
-def render(conn):
+def render():
     st.title("Settings")
     
     st.subheader("Configuration")
     st.text_input("Notion Token", value=settings.NOTION_TOKEN, type="password", disabled=True)
     st.caption("Set via .env file")
+
+    # Notion/Drive clients are cached per process; drop them after changing credentials
+    if st.button("🔄 Reconnect Notion & Drive"):
+        clear_client_caches()
+        st.success("Clients will reconnect on next use.")
     
     st.subheader("Database")
     st.write(f"Path: `{settings.DATABASE_PATH}`")
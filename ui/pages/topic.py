@@ -1,20 +1,18 @@
 import streamlit as st
-from database.repositories.topic_repo import TopicRepository
-from database.repositories.module_repo import ModuleRepository
+from ui.cache import get_module_cached, get_topic_cached
 from ui.components.vault import render_vault
 from ui.components.stage_cards import render_stage_cards
 from ui.components.generation_modal import show_generation_modal
 from config.settings import settings
 
-def render(conn, topic_id: str):
-    topic_repo = TopicRepository(conn)
-    module_repo = ModuleRepository(conn)
-    topic = topic_repo.get_by_id(topic_id)
+def render(topic_id: str):
+    # Served from cache across reruns; writes call clear_lookup_caches()
+    topic = get_topic_cached(topic_id)
     if not topic:
         st.error("Topic not found!")
         return
         
-    module = module_repo.get_by_id(topic.module_id)
+    module = get_module_cached(topic.module_id)
     
     st.title(f"{module.name} / {topic.name}")
     
@@ -24,7 +22,7 @@ def render(conn, topic_id: str):
     tab1, tab2 = st.tabs(["📚 Content Vault", "✨ Generations"])
     
     with tab1:
-        render_vault(conn, module, topic)
+        render_vault(module, topic)
         
     with tab2:
         st.header("AI Generation Pipeline")
@@ -38,21 +36,15 @@ def render(conn, topic_id: str):
         # Render stage cards
         clicked_stage = render_stage_cards(
             topic_id=topic.id,
-            module_name=module.name,
-            conn=conn
+            module_name=module.name
         )
 
         # If user clicked Generate/Regenerate, show modal
         if clicked_stage:
-            # Show generation modal (database ID fetched from module)
-            success = show_generation_modal(
+            # Show generation modal (database ID fetched from module); it
+            # reruns the page itself once the user closes its success panel
+            show_generation_modal(
                 topic_id=topic.id,
                 stage=clicked_stage,
-                module_name=module.name,
-                conn=conn
+                module_name=module.name
             )
-
-            # If generation completed, celebrate and refresh
-            if success:
-                st.balloons()
-                st.rerun()